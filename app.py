@@ -1,9 +1,31 @@
 import streamlit as st
-import pandas as pd
 import json
+import bisect
+import os
 import datetime
-from typing import Dict, List, Optional
-import plotly.express as px
+import functools
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from streamlit.errors import StreamlitAPIException
+
+import records
+from archive import LogArchive
+from assignment import balanced_assignment
+from deadlines import DeadlineIndex, MilestoneIndex, due_at
+from log_io import json_export, ndjson_export, read_log_import, validate_log_import
+from log_state import LogState
+from profiling import RerunProfiler
+from records import LogRecord, date_to_day, day_to_date, epoch_seconds, format_timestamp
+from rollups import SECONDS_PER_HOUR, LogRollups
+from storage import ARCHIVED_THROUGH, LogStore, TaskConflict, open_store
+from team import (LOG_STATUSES, LOG_TASK_TYPES, MAX_TIME_SPENT, OPEN_TASK_STATUSES, TASK_STATUSES, TEAM_MEMBERS,
+                  USERS, linked_task_status)
+
+# pandas and Plotly take most of a cold start and the login page needs
+# neither; they are imported where used, and preloaded in the background
+# once the login page is up (see _preload_heavy_modules).
+if TYPE_CHECKING:
+    import pandas as pd
 
 st.set_page_config(
     page_title="Legal Doc AI - Hackathon Log",
@@ -46,22 +68,51 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-USERS = {
-    "Arryan":   {"password": "123",     "role": "API/Data Fetch", "is_leader": False},
-    "Arth":     {"password": "123",     "role": "Backend 1",      "is_leader": False},
-    "Shashwat": {"password": "123",     "role": "Backend 2",      "is_leader": False},
-    "Member 4": {"password": "leader",  "role": "Team Leader",    "is_leader": True},
-}
+# Logs are held as LogRecords, which store these fields as codes into shared tables.
+records.MEMBERS.update(TEAM_MEMBERS)
+records.ROLES.update(TEAM_MEMBERS.values())
+records.STATUSES.update(LOG_STATUSES + TASK_STATUSES)
+records.TASK_TYPES.update(LOG_TASK_TYPES)
 
-TEAM_MEMBERS = {u: USERS[u]["role"] for u in USERS}
+LOG_STORE_URL = os.environ.get("HACKATHON_LOG_STORE", "sqlite:///hackathon_log.db")
+
+# Rerun profiling: "panel" keeps the last reruns for the leader sidebar panel,
+# "file" appends every rerun as a JSON line to PROFILE_FILE; both may be given.
+PROFILE_MODES = {m.strip() for m in os.environ.get("HACKATHON_PROFILE", "").split(",") if m.strip()}
+PROFILE_FILE = os.environ.get("HACKATHON_PROFILE_FILE", "hackathon_profile.jsonl")
+
+# Sealed log segments; the directory belongs to the store above and must not be shared between stores.
+ARCHIVE_DIR = os.environ.get("HACKATHON_ARCHIVE_DIR", "hackathon_archive")
+ARCHIVE_AFTER_DAYS = int(os.environ.get("HACKATHON_ARCHIVE_AFTER_DAYS", "7"))
+
+@st.cache_resource
+def get_store() -> LogStore:
+    return open_store(LOG_STORE_URL)
+
+@st.cache_resource
+def get_archive() -> LogArchive:
+    return LogArchive(ARCHIVE_DIR)
+
+@st.cache_resource
+def get_log_state() -> LogState:
+    """The decoded logs and their indexes, shared by all sessions; each session keeps only its cursor."""
+    return LogState()
+
+def _import_heavy_modules():
+    import pandas
+    import plotly.express
+
+@st.cache_resource(show_spinner=False)
+def _preload_heavy_modules() -> threading.Thread:
+    """Import pandas and Plotly on a background thread, once per process."""
+    thread = threading.Thread(target=_import_heavy_modules, name="preload-imports", daemon=True)
+    thread.start()
+    return thread
 
 def _init_state():
     if "current_user" not in st.session_state:
         st.session_state.current_user = None
 
-    if "logs" not in st.session_state:
-        st.session_state.logs: List[Dict] = []
-
     if "member_duties" not in st.session_state:
         st.session_state.member_duties = {
             "Arryan": [
@@ -86,23 +137,239 @@ def _init_state():
             ],
         }
 
+    # Task registry: id -> task, plus (member, status) -> {id: task} buckets
     if "tasks" not in st.session_state:
-        st.session_state.tasks: List[Dict] = []
+        st.session_state.tasks: Dict[str, Dict] = {}
+    if "task_index" not in st.session_state:
+        st.session_state.task_index: Dict[tuple, Dict[str, Dict]] = {}
+        st.session_state.task_index_keys: Dict[str, tuple] = {}
+    # Task ids by due time: every task with a deadline, and only the open ones;
+    # the tasks without one are all filed under 0, i.e. in creation order
+    if "task_deadlines" not in st.session_state:
+        st.session_state.task_deadlines = DeadlineIndex()
+        st.session_state.open_task_deadlines = DeadlineIndex()
+        st.session_state.undated_tasks = DeadlineIndex()
 
     if "timeline" not in st.session_state:
         st.session_state.timeline: List[Dict] = []
+        st.session_state.milestone_index = MilestoneIndex()
+
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = RerunProfiler(
+            enabled=bool(PROFILE_MODES & {"panel", "file"}),
+            keep_history="panel" in PROFILE_MODES,
+            sink_path=PROFILE_FILE if "file" in PROFILE_MODES else None,
+        )
+
+    # Cursors into the durable store: only newer rows are pulled on a rerun. The logs
+    # themselves are pulled into the shared get_log_state(); log_cursor is how far
+    # this session has seen them.
+    for cursor in ("log_cursor", "task_cursor", "timeline_cursor"):
+        if cursor not in st.session_state:
+            st.session_state[cursor] = 0
+
+def _apply_task_changes(changes: List[Tuple[int, str, Optional[Dict]]]):
+    """Fold ``(rev, task_id, task or None)`` changes into the session's task registry and indexes."""
+    state = st.session_state
+    # Session-state attribute access goes through a proxy, so look everything up once per batch.
+    tasks, task_index, task_index_keys = state.tasks, state.task_index, state.task_index_keys
+    task_deadlines, open_task_deadlines, undated_tasks = state.task_deadlines, state.open_task_deadlines, state.undated_tasks
+    for _, task_id, task in changes:
+        # The bucket a task was filed under is remembered separately rather than
+        # read off the (possibly already replaced) task dict.
+        old_key = task_index_keys.pop(task_id, None)
+        if old_key is not None:
+            bucket = task_index[old_key]
+            bucket.pop(task_id, None)
+            if not bucket:
+                del task_index[old_key]
+        tasks.pop(task_id, None)
+        if task is not None:
+            task["member"] = records.MEMBERS.intern(task["member"])
+            task["status"] = records.STATUSES.intern(task["status"])
+            key = (task["member"], task["status"])
+            tasks[task_id] = task
+            task_index.setdefault(key, {})[task_id] = task
+            task_index_keys[task_id] = key
+        due = due_at(task.get("deadline")) if task is not None else None
+        task_deadlines.set(task_id, due)
+        undated_tasks.set(task_id, 0 if task is not None and due is None else None)
+        open_task_deadlines.set(task_id, due if due is not None and task["status"] in OPEN_TASK_STATUSES else None)
+
+def get_task(task_id: str) -> Optional[Dict]:
+    return st.session_state.tasks.get(task_id)
+
+def find_tasks(member: Optional[str] = None, statuses: Optional[List[str]] = None) -> List[Dict]:
+    """Tasks for a member and/or set of statuses, read from the index buckets."""
+    if member is None and statuses is None:
+        return list(st.session_state.tasks.values())
+    found = []
+    for (m, status), bucket in st.session_state.task_index.items():
+        if (member is None or m == member) and (statuses is None or status in statuses):
+            found.extend(bucket.values())
+    _profiler().count("tasks_scanned", len(found))
+    return found
+
+def tasks_by_deadline(undated_on: Optional[datetime.date] = None) -> Iterator[Dict]:
+    """All tasks, soonest deadline first, then the ones without a deadline.
+
+    Given ``undated_on``, tasks without a deadline come after those due that day instead.
+    Ties are in creation order.
+    """
+    tasks, index = st.session_state.tasks, st.session_state.task_deadlines
+    undated = (tasks[task_id] for task_id in st.session_state.undated_tasks)
+    if undated_on is None:
+        yield from (tasks[task_id] for task_id in index)
+        yield from undated
+    else:
+        cutoff = due_at(undated_on) + 1
+        yield from (tasks[task_id] for task_id in index.between(None, cutoff))
+        yield from undated
+        yield from (tasks[task_id] for task_id in index.between(cutoff, None))
+
+def tasks_for_review(tasks: Iterable[Dict]) -> List[Dict]:
+    """``tasks`` unapproved first, each group by deadline (undated ones counted as due today).
+
+    Read off the deadline index in one pass rather than sorted on every rerun.
+    """
+    wanted = {t["id"] for t in tasks}
+    # Grouped on (approved, status != "Approved"), in that order.
+    groups = ([], [], [], [])
+    for t in tasks_by_deadline(undated_on=datetime.date.today()):
+        if t["id"] in wanted:
+            groups[2 * t["approved"] + (t["status"] != "Approved")].append(t)
+    return [t for group in groups for t in group]
+
+AT_RISK_STATUSES = ["Assigned"]
+
+def deadline_alerts(now: int, within_hours: int) -> Dict[str, List[Dict]]:
+    """Open tasks past their deadline, due within ``within_hours``, and of those, not started yet."""
+    index, tasks = st.session_state.open_task_deadlines, st.session_state.tasks
+    due_soon = [tasks[i] for i in index.between(now, now + within_hours * SECONDS_PER_HOUR)]
+    return {
+        "overdue": [tasks[i] for i in index.between(None, now)],
+        "due_soon": due_soon,
+        "at_risk": [t for t in due_soon if t["status"] in AT_RISK_STATUSES],
+    }
 
-    if "id_counter" not in st.session_state:
-        st.session_state.id_counter = 0
+def _reset_log_state():
+    """Rebuild the shared log state from the store and archive, e.g. after sealing."""
+    get_log_state.clear()
+    _sync_state()
+
+def _sync_state():
+    """Pull writes made since this session's cursors (by any session) from the store."""
+    store = get_store()
+    log_state = get_log_state()
+    _profiler().count("logs_synced", log_state.sync(store, get_archive()))
+    st.session_state.log_cursor = log_state.cursor
+    changed = store.tasks_since(st.session_state.task_cursor)
+    if changed:
+        _apply_task_changes(changed)
+        st.session_state.task_cursor = changed[-1][0]
+    for seq, milestone in store.timeline_since(st.session_state.timeline_cursor):
+        st.session_state.timeline.append(milestone)
+        st.session_state.milestone_index.add(milestone)
+        st.session_state.timeline_cursor = seq
+
+TASK_CONFLICT_MESSAGE = "⚠️ Someone else changed this task in the meantime. The list has been refreshed — please try again."
+LINKED_TASK_CONFLICT_MESSAGE = "⚠️ The log was saved, but its linked task kept changing and its status was not updated. Please update the task yourself."
+
+def _save_tasks(tasks: List[Dict]) -> bool:
+    """Write task copies carrying the version they were read at.
+
+    Returns False if any of them was changed by another session first; nothing
+    is written then, and the session is refreshed with the winning state.
+    """
+    now = datetime.datetime.now()
+    for task in tasks:
+        task["updated_at"] = now
+    try:
+        get_store().put_tasks(tasks)
+    except TaskConflict:
+        return False
+    finally:
+        _sync_state()
+    return True
+
+def update_tasks(tasks: List[Dict], **changes) -> bool:
+    # Indexed task dicts are never edited in place, so a rejected write leaves them intact.
+    return _save_tasks([dict(t, **changes) for t in tasks])
+
+def update_task(task: Dict, **changes) -> bool:
+    return update_tasks([task], **changes)
+
+def _delete_tasks(tasks: List[Dict]) -> bool:
+    try:
+        get_store().delete_tasks([(t["id"], t.get("version", 0)) for t in tasks])
+    except TaskConflict:
+        return False
+    finally:
+        _sync_state()
+    return True
+
+def _profiler() -> RerunProfiler:
+    return st.session_state.profiler
 
 _init_state()
-def _new_id(prefix="T"):
-    st.session_state.id_counter += 1
-    return f"{prefix}-{int(datetime.datetime.now().timestamp())}-{st.session_state.id_counter}"
+_profiler().start_rerun(st.session_state.current_user or "")
+with _profiler().span("sync_state"):
+    _sync_state()
+ASSIGNMENT_MODES = ["Round-robin", "Fewest open tasks", "Fewest open tasks due by the deadline", "Least logged time"]
+
+def assignment_loads(mode: str, members: List[str], deadline: datetime.date):
+    """Per-member ``(loads, costs)`` for ``balanced_assignment`` under an assignment mode."""
+    if mode == "Round-robin":
+        return {m: 0 for m in members}, {m: 1 for m in members}
+    if mode == "Least logged time":
+        # A new task is expected to take the team's average minutes per log.
+        team = get_team_stats()
+        per_task = team['total_time'] / team['total_tasks'] if team['total_tasks'] else 60
+        return ({m: get_member_stats(m)['total_time'] for m in members},
+                {m: per_task or 1 for m in members})
+    loads = {}
+    for m in members:
+        open_tasks = find_tasks(member=m, statuses=OPEN_TASK_STATUSES)
+        if mode == "Fewest open tasks due by the deadline":
+            # Only work due in the same window competes with the new tasks.
+            open_tasks = [t for t in open_tasks if not t.get("deadline") or t["deadline"] <= deadline]
+        loads[m] = len(open_tasks)
+    return loads, {m: 1 for m in members}
+
+TASK_BULK_ACTIONS = ["Approve", "Mark Completed", "Reset to Assigned", "Delete", "Reassign", "Move deadline"]
+
+def apply_task_action(action: str, tasks: List[Dict], member: Optional[str] = None,
+                      deadline: Optional[datetime.date] = None) -> Optional[int]:
+    """Apply a bulk action to ``tasks`` in one store write.
+
+    Tasks the action doesn't apply to are skipped. Returns how many were
+    changed, or None if the write lost a race (and nothing was changed).
+    """
+    if action == "Delete":
+        return len(tasks) if _delete_tasks(tasks) else None
+    if action == "Approve":
+        todo, changes = [t for t in tasks if t["status"] != "Approved"], {"status": "Approved", "approved": True}
+    elif action == "Mark Completed":
+        todo, changes = [t for t in tasks if t["status"] in OPEN_TASK_STATUSES], {"status": "Completed"}
+    elif action == "Reset to Assigned":
+        todo, changes = [t for t in tasks if t["status"] != "Assigned"], {"status": "Assigned", "approved": False}
+    elif action == "Reassign":
+        todo, changes = [t for t in tasks if t["member"] != member], {"member": member}
+    elif action == "Move deadline":
+        todo, changes = [t for t in tasks if t.get("deadline") != deadline], {"deadline": deadline}
+    else:
+        raise ValueError(f"unknown task action: {action}")
+    if todo and not update_tasks(todo, **changes):
+        return None
+    return len(todo)
+
+def _new_ids(prefix: str, count: int) -> List[str]:
+    # Numbered from a store-wide counter, so ids never collide across sessions or restarts.
+    return [f"{prefix}-{n}" for n in get_store().allocate_ids(prefix, count)]
 
-def add_log_entry(member: str, task: str, status: str, time_spent: int, notes: str, task_type: str = "Custom", linked_task_id: Optional[str] = None):
+def add_log_entry(member: str, task: str, status: str, time_spent: int, notes: str, task_type: str = "Custom", linked_task_id: Optional[str] = None) -> bool:
     entry = {
-        'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'timestamp': epoch_seconds(datetime.datetime.now()),
         'member': member,
         'role': TEAM_MEMBERS.get(member, "Member"),
         'task': task,
@@ -112,35 +379,117 @@ def add_log_entry(member: str, task: str, status: str, time_spent: int, notes: s
         'notes': notes,
         'linked_task_id': linked_task_id
     }
-    st.session_state.logs.append(entry)
-
-    if linked_task_id:
-        for t in st.session_state.tasks:
-            if t["id"] == linked_task_id:
-                t["updated_at"] = datetime.datetime.now()
-                if status in ["In Progress"] and t["status"] == "Assigned":
-                    t["status"] = "In Progress"
-                if status == "Completed":
-                    t["status"] = "Completed"
-                break
+    return add_log_entries([entry])
+
+def add_log_entries(entries: List[Dict]) -> bool:
+    """Write a batch of log entries, and the status of the tasks they link to, in one store write each.
+
+    Returns False if the linked tasks kept changing under us and were left as
+    they were; the log entries are saved either way.
+    """
+    get_store().append_logs(entries)
+
+    saved = False
+    for _ in range(3):  # retry if a linked task is changed by someone else meanwhile
+        linked = {}
+        for entry in entries:
+            task_id = entry.get('linked_task_id')
+            t = (linked.get(task_id) or get_task(task_id)) if task_id else None
+            if t is not None:
+                linked[task_id] = dict(t, status=linked_task_status(t["status"], entry['status']))
+        if not linked or _save_tasks(list(linked.values())):
+            saved = True
+            break
+    _sync_state()
+    return saved
 
 def get_member_stats(member: str) -> Dict:
-    member_logs = [log for log in st.session_state.logs if log['member'] == member]
-    total_time = sum(log['time_spent'] for log in member_logs)
-    total_tasks = len(member_logs)
-    completed_tasks = len([log for log in member_logs if log['status'] == 'Completed'])
+    stats = get_log_state().member_stats.get(member, {})
+    total_tasks = stats.get('total_tasks', 0)
+    completed_tasks = stats.get('completed_tasks', 0)
     return {
-        'total_time': total_time,
+        'total_time': stats.get('total_time', 0),
         'total_tasks': total_tasks,
         'completed_tasks': completed_tasks,
+        'completed_duties': stats.get('completed_duties', 0),
         'completion_rate': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
     }
 
-def export_to_google_docs_format():
-    """Export logs + tasks + timeline in a Google Docs friendly .txt content."""
-    if not st.session_state.logs:
-        base_stats = "No logs available to export."
-    content = f"""
+def get_team_stats() -> Dict:
+    """Team-wide totals, summed from the per-member index (O(members))."""
+    per_member = list(get_log_state().member_stats.values())
+    return {
+        'total_time': sum(s['total_time'] for s in per_member),
+        'total_tasks': sum(s['total_tasks'] for s in per_member),
+        'completed_tasks': sum(s['completed_tasks'] for s in per_member),
+    }
+
+def latest_first(logs: List[LogRecord], time_ordered: Optional[bool] = None) -> List[LogRecord]:
+    if get_log_state().time_ordered if time_ordered is None else time_ordered:
+        return logs[::-1]
+    return sorted(logs, key=lambda x: x.timestamp, reverse=True)
+
+# Shared by every session: a section's version is made of store-wide seqs
+# and cursors, so sessions that have synced the same data reuse one text.
+# Bounded to about two reports' worth of sections.
+@st.cache_resource(max_entries=16)
+def _cached_section(key: str, version, _render: Callable[[], Iterator[str]]) -> str:
+    """A report section's text, re-rendered only when its ``version`` is new."""
+    return "".join(_render())
+
+def _member_log_section(member: str, member_logs: List[LogRecord], count: int, stats: Dict,
+                        time_ordered: bool) -> Iterator[str]:
+    # Only the first ``count`` logs: the list may have grown since the report was requested.
+    yield f"""
+--- {member.upper()} ({TEAM_MEMBERS[member]}) ---
+Stats: {stats['completed_tasks']}/{stats['total_tasks']} tasks completed | {stats['total_time']} minutes total
+
+"""
+    for log in latest_first(member_logs[:count], time_ordered):
+        yield f"""
+[{format_timestamp(log.timestamp)}] {log.status.upper()}
+Task: {log.task}  {'(Linked Task: '+log.linked_task_id+')' if log.linked_task_id else ''}
+Type: {log.task_type or 'Custom'}
+Time Spent: {log.time_spent} minutes
+Notes: {log.notes if log.notes else 'No additional notes'}
+---
+"""
+
+def _duties_section(member_duties: Dict[str, List[str]]) -> Iterator[str]:
+    for member, duties in member_duties.items():
+        yield f"""
+{member} ({TEAM_MEMBERS[member]}):
+{chr(10).join([f"  • {duty}" for duty in duties])}
+"""
+
+def _tasks_section(tasks: List[Dict]) -> Iterator[str]:
+    if tasks:
+        for t in tasks:
+            yield f"""
+ID: {t['id']} | {t['task']}
+Assigned To: {t['member']} | Deadline: {t['deadline']} | Status: {t['status']} | Approved: {t['approved']}
+"""
+    else:
+        yield "No leader-assigned tasks.\n"
+
+def _timeline_report_section(timeline: List[Dict]) -> Iterator[str]:
+    if timeline:
+        for m in timeline:
+            yield f"""
+• {m['title']} | {m['start']} → {m['end']}
+  Notes: {m.get('notes','-')}
+"""
+    else:
+        yield "No timeline items yet.\n"
+
+def report_parts() -> List:
+    """The Google Docs friendly report (logs + tasks + timeline) as text pieces,
+    with a ``(key, version, render)`` triple for each cacheable section.
+
+    Everything a section is rendered from is taken from the session here, so
+    ``render_report`` can run later and off the script thread.
+    """
+    parts = [f"""
 LEGAL DOCUMENT AI - HACKATHON LOG REPORT
 Generated: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -154,34 +503,28 @@ Team Members:
 ========================================
 DETAILED LOG ENTRIES
 ========================================
-"""
-
-    # Group logs by member
+"""]
+    log_state = get_log_state()
+    summarized_through = log_state.summarized_through
+    if log_state.summarized_count:
+        parts.append(f"({log_state.summarized_count} older entries are archived: counted in the stats, not listed here.)\n")
+
+    # Logs are already grouped by member by the log state; they only ever grow,
+    # in seq order, so the last seq identifies a member's section.
     for member in TEAM_MEMBERS.keys():
-        member_logs = [log for log in st.session_state.logs if log['member'] == member]
+        member_logs = log_state.logs_by_member.get(member)
         if member_logs:
-            stats = get_member_stats(member)
-            content += f"""
---- {member.upper()} ({TEAM_MEMBERS[member]}) ---
-Stats: {stats['completed_tasks']}/{stats['total_tasks']} tasks completed | {stats['total_time']} minutes total
-
-"""
-            for log in sorted(member_logs, key=lambda x: x['timestamp'], reverse=True):
-                content += f"""
-[{log['timestamp']}] {log['status'].upper()}
-Task: {log['task']}  {'(Linked Task: '+log['linked_task_id']+')' if log.get('linked_task_id') else ''}
-Type: {log.get('task_type','Custom')}
-Time Spent: {log['time_spent']} minutes
-Notes: {log['notes'] if log['notes'] else 'No additional notes'}
----
-"""
-
-    total_logs = len(st.session_state.logs)
-    total_time = sum(log['time_spent'] for log in st.session_state.logs)
-    completed_tasks = len([log for log in st.session_state.logs if log['status'] == 'Completed'])
+            parts.append((f"logs:{member}", (member_logs[-1].seq, len(member_logs), summarized_through),
+                          functools.partial(_member_log_section, member, member_logs, len(member_logs),
+                                            get_member_stats(member), log_state.time_ordered)))
+
+    team = get_team_stats()
+    total_logs = team['total_tasks']
+    total_time = team['total_time']
+    completed_tasks = team['completed_tasks']
     team_completion_rate = (completed_tasks / total_logs * 100) if total_logs else 0.0
 
-    content += f"""
+    parts.append(f"""
 ========================================
 SUMMARY STATISTICS
 ========================================
@@ -194,44 +537,62 @@ Team Completion Rate: {team_completion_rate:.1f}%
 ========================================
 PROJECT DUTIES STATUS
 ========================================
-"""
-    for member, duties in st.session_state.member_duties.items():
-        content += f"""
-{member} ({TEAM_MEMBERS[member]}):
-{chr(10).join([f"  • {duty}" for duty in duties])}
-"""
+""")
+    # Duties are fixed for the session.
+    parts.append(("duties", None, functools.partial(_duties_section, st.session_state.member_duties)))
 
-    content += f"""
+    parts.append(f"""
 
 ========================================
 ASSIGNED TASKS (LEADER)
 ========================================
-"""
-    if st.session_state.tasks:
-        for t in sorted(st.session_state.tasks, key=lambda x: (x.get("deadline") or datetime.date.today())):
-            content += f"""
-ID: {t['id']} | {t['task']}
-Assigned To: {t['member']} | Deadline: {t['deadline']} | Status: {t['status']} | Approved: {t['approved']}
-"""
-    else:
-        content += "No leader-assigned tasks.\n"
+""")
+    parts.append(("tasks", st.session_state.task_cursor, functools.partial(_tasks_section, list(tasks_by_deadline()))))
 
-    content += f"""
+    parts.append(f"""
 
 ========================================
 PROJECT TIMELINE
 ========================================
-"""
-    if st.session_state.timeline:
-        for m in st.session_state.timeline:
-            content += f"""
-• {m['title']} | {m['start']} → {m['end']}
-  Notes: {m.get('notes','-')}
-"""
-    else:
-        content += "No timeline items yet.\n"
+""")
+    parts.append(("timeline", st.session_state.timeline_cursor,
+                  functools.partial(_timeline_report_section, list(st.session_state.timeline))))
+    return parts
 
-    return content
+def render_report(parts: List) -> str:
+    """The report text; sections cached under the same version are reused, not re-rendered."""
+    return "".join(part if isinstance(part, str) else _cached_section(*part) for part in parts)
+
+def export_to_google_docs_format() -> str:
+    """Export logs + tasks + timeline in a Google Docs friendly .txt content."""
+    return render_report(report_parts())
+
+def archived_logs(since_seq: int = 0, since_timestamp: Optional[int] = None) -> List[LogRecord]:
+    """Entries this session holds only as archive summaries, read back from their segments."""
+    found = []
+    for segment in get_archive().segments(get_log_state().summarized_through):
+        if segment.last_seq <= since_seq or (since_timestamp is not None
+                                             and segment.summary["last_timestamp"] <= since_timestamp):
+            continue
+        found.extend(log for log in segment.reader()
+                     if log.seq > since_seq and (since_timestamp is None or log.timestamp > since_timestamp))
+    return found
+
+def logs_since_seq(seq: int) -> List[LogRecord]:
+    """Logs with a sequence number greater than ``seq`` (logs are held in seq order)."""
+    log_state = get_log_state()
+    logs = log_state.logs
+    live = logs[bisect.bisect_right(logs, seq, key=lambda l: l.seq):]
+    return archived_logs(since_seq=seq) + live if seq < log_state.summarized_through else live
+
+def logs_since_timestamp(timestamp: int) -> List[LogRecord]:
+    log_state = get_log_state()
+    logs = log_state.logs
+    if not log_state.time_ordered:
+        live = [l for l in logs if l.timestamp > timestamp]
+    else:
+        live = logs[bisect.bisect_right(logs, timestamp, key=lambda l: l.timestamp):]
+    return archived_logs(since_timestamp=timestamp) + live
 
 def login_view():
     st.markdown('<h1 class="main-header">⚖ Legal Document AI - Hackathon Log</h1>', unsafe_allow_html=True)
@@ -265,23 +626,49 @@ def sidebar_block(is_leader: bool):
         # Duties list
 
         if st.button("📋 Generate Google Docs Report"):
-            report_content = export_to_google_docs_format()
+            # Only the inputs are gathered now; the text is rendered when the download is clicked.
+            with _profiler().span("report.build"):
+                parts = report_parts()
             st.download_button(
                 label="📥 Download Report",
-                data=report_content,
+                data=functools.partial(render_report, parts),
                 file_name=f"Legal_AI_Hackathon_Log_{datetime.date.today()}.txt",
                 mime="text/plain",
                 help="Download as .txt file - Copy content to Google Docs"
             )
 
+        export_mode = st.selectbox("Log export format:", ["JSON (full)", "NDJSON (full)", "NDJSON (since last export)", "NDJSON (since timestamp)"])
+        if export_mode == "NDJSON (since timestamp)":
+            since_date = st.date_input("Since date", value=datetime.date.today())
+            since_time = st.time_input("Since time", value=datetime.time(0, 0))
         if st.button("📊 Export Raw JSON"):
-            json_data = json.dumps(st.session_state.logs, indent=2, default=str)
-            st.download_button(
-                label="📥 Download JSON",
-                data=json_data,
-                file_name=f"hackathon_logs_{datetime.date.today()}.json",
-                mime="application/json"
-            )
+            if export_mode == "JSON (full)":
+                st.download_button(
+                    label="📥 Download JSON",
+                    data=functools.partial(json_export, logs_since_seq(0)),
+                    file_name=f"hackathon_logs_{datetime.date.today()}.json",
+                    mime="application/json"
+                )
+            else:
+                cursor_key = f"export_cursor:{st.session_state.current_user}"
+                advance_cursor = None
+                if export_mode == "NDJSON (full)":
+                    export_logs = logs_since_seq(0)
+                elif export_mode == "NDJSON (since last export)":
+                    export_logs = logs_since_seq(int(get_store().get_meta(cursor_key, "0")))
+                    # Moved only once this export is actually downloaded.
+                    if export_logs:
+                        advance_cursor = functools.partial(get_store().set_meta, cursor_key, str(export_logs[-1]['seq']))
+                else:
+                    export_logs = logs_since_timestamp(epoch_seconds(datetime.datetime.combine(since_date, since_time)))
+                st.caption(f"{len(export_logs)} log entries in this export.")
+                st.download_button(
+                    label="📥 Download NDJSON",
+                    data=functools.partial(ndjson_export, export_logs),
+                    file_name=f"hackathon_logs_{datetime.date.today()}.ndjson",
+                    mime="application/x-ndjson",
+                    on_click=advance_cursor or "rerun"
+                )
 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -292,15 +679,188 @@ def sidebar_block(is_leader: bool):
 
         if is_leader:
             st.info("👑 You are viewing the Leader tools.")
+            if _profiler().history:
+                profile_panel()
+
+def profile_panel():
+    """Per-rerun timing breakdown (ms) and scan counters for the last reruns, newest first."""
+    import pandas as pd
+    with st.expander("⏱ Rerun Profile"):
+        rows = []
+        for record in reversed(_profiler().history):
+            row = {"started": datetime.datetime.fromtimestamp(record["started"]).strftime("%H:%M:%S"),
+                   "total": round(record["total_s"] * 1000, 1)}
+            row.update({name: round(sec * 1000, 1) for name, sec in record["spans"].items()})
+            row.update(record["counters"])
+            rows.append(row)
+        st.dataframe(pd.DataFrame(rows).fillna(0), hide_index=True)
+        st.caption("Span times in ms (nested spans overlap their parents); counters are rows scanned/rendered.")
+
+def _intersect(small: List[int], big: List[int]) -> List[int]:
+    """Intersect two ascending position lists by binary-searching the larger one."""
+    out = []
+    for p in small:
+        i = bisect.bisect_left(big, p)
+        if i < len(big) and big[i] == p:
+            out.append(p)
+    return out
+
+def query_logs(filters: Dict[str, str], sort_by: str = "Timestamp (Latest)", search: str = "") -> List[LogRecord]:
+    """Filter logs through the posting lists and order them without a comparison sort.
+
+    ``filters`` maps an indexed field to a wanted value ("All" means no filter);
+    ``search`` is a full-text query over task and notes.
+    Logs are normally stored in timestamp order, so the timestamp sorts are
+    slices; the Member/Status sorts bucket the matches by value (stable, like
+    list.sort).
+    """
+    log_state = get_log_state()
+    logs = log_state.logs
+    postings = [log_state.postings[field].get(value, [])
+                for field, value in filters.items() if value != "All"]
+    if search.strip():
+        postings.append(log_state.search_index.search(search))
+    if postings:
+        postings.sort(key=len)
+        positions = postings[0]
+        for other in postings[1:]:
+            positions = _intersect(positions, other)
+    else:
+        positions = range(len(logs))
+    _profiler().count("logs_scanned", len(positions))
+
+    if sort_by.startswith("Timestamp") and not log_state.time_ordered:
+        positions = sorted(positions, key=lambda p: logs[p].timestamp)
+    if sort_by == "Timestamp (Latest)":
+        return [logs[p] for p in reversed(positions)]
+    if sort_by == "Timestamp (Oldest)":
+        return [logs[p] for p in positions]
+    field = 'member' if sort_by == "Member" else 'status'
+    buckets: Dict[str, List[LogRecord]] = {}
+    for p in positions:
+        buckets.setdefault(getattr(logs[p], field), []).append(logs[p])
+    return [log for value in sorted(buckets) for log in buckets[value]]
+
+LOG_PAGE_SIZES = [10, 25, 50, 100]
+
+def paginate(items: List, key: str) -> List:
+    """Render page controls and return only the visible slice of ``items``."""
+    c1, c2 = st.columns([1, 3])
+    with c1:
+        page_size = st.selectbox("Logs per page", LOG_PAGE_SIZES, index=1, key=f"{key}-size")
+    pages = max(1, -(-len(items) // page_size))
+    # Filters can shrink the result set under a previously chosen page.
+    if st.session_state.get(f"{key}-page", 1) > pages:
+        st.session_state[f"{key}-page"] = pages
+    with c2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=f"{key}-page")
+    start = (page - 1) * page_size
+    visible = items[start:start + page_size]
+    _profiler().count("log_cards_rendered", len(visible))
+    return visible
+
+def view_fragment(render):
+    """``st.fragment`` for an interactive section: its widgets rerun only the
+    section. A fragment rerun skips the top-level sync, so it syncs first."""
+    @st.fragment
+    @functools.wraps(render)
+    def fragment(*args, **kwargs):
+        _sync_state()
+        return render(*args, **kwargs)
+    return fragment
+
+def rerun_view():
+    """Rerun only the current fragment after a change, or the whole app if
+    this is a full run (a fragment-scoped rerun is only allowed in a fragment rerun)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def lazy_tabs(labels: List[str], key: str):
+    # A tab switch reruns the app, so only the selected tab's body has to run (see render_tab).
+    return st.tabs(labels, key=key, on_change="rerun")
+
+def render_tab(tab, span_name: str, render, *args):
+    with tab:
+        if tab.open:
+            with _profiler().span(span_name):
+                render(*args)
+
+# Shared by every session and keyed on the log cursor (the store's log
+# version) and the chosen view, so figures are rebuilt only after a write;
+# a handful of recent versions are kept while sessions catch up. Everything
+# is read off the rollups, never the logs themselves.
+@st.cache_resource(max_entries=8)
+def _dashboard_figures(log_version: int, start_day: int, end_day: int, hourly: bool,
+                       _rollups: LogRollups, _totals: Dict):
+    import pandas as pd
+    with _profiler().span("dashboard.dataframe"):
+        time_by_member: Dict[str, int] = {}
+        status_counts: Dict[str, int] = {}
+        for (member, status), (count, minutes) in _totals.items():
+            member_role = f"{member} ({TEAM_MEMBERS[member]})"
+            time_by_member[member_role] = time_by_member.get(member_role, 0) + minutes
+            status_counts[status] = status_counts.get(status, 0) + count
+        time_by_member = pd.Series(time_by_member).sort_index()
+        status_counts = pd.Series(status_counts).sort_values(ascending=False, kind="stable")
+
+        series = _rollups.counts_by_member(hourly, start_day, end_day)
+        _profiler().count("rollup_buckets_scanned", len(series))
+        progress = pd.DataFrame.from_dict(series, orient="index").fillna(0).astype(int).sort_index().sort_index(axis=1)
+        if hourly:
+            progress.index = pd.to_datetime(progress.index * SECONDS_PER_HOUR, unit="s")
+        else:
+            progress.index = progress.index.map(day_to_date)
+        progress.index.name = "timestamp"
+        progress.columns.name = "member"
+
+    with _profiler().span("dashboard.plotly"):
+        return _build_dashboard_figures(time_by_member, status_counts, progress, hourly)
+
+def _build_dashboard_figures(time_by_member, status_counts, member_progress, hourly=False):
+    import plotly.express as px
+    fig_pie = px.pie(values=time_by_member.values, names=time_by_member.index, title="⏰ Time Distribution by Member",
+                     color_discrete_sequence=px.colors.qualitative.Set3)
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+
+    colors = {'Completed': '#4caf50', 'In Progress': '#ff9800', 'Not Started': '#f44336', 'Blocked': '#9c27b0'}
+    fig_bar = px.bar(x=status_counts.index, y=status_counts.values, title="📈 Task Status Overview",
+                     color=status_counts.index, color_discrete_map=colors)
+    fig_bar.update_layout(showlegend=False)
 
+    title = "🕐 Hourly Progress by Member" if hourly else "📅 Daily Progress by Member"
+    fig_timeline = px.line(member_progress, title=title, markers=True)
+    fig_timeline.update_layout(xaxis_title="Hour" if hourly else "Date", yaxis_title="Tasks Completed", legend_title="Team Member")
+
+    return fig_pie, fig_bar, fig_timeline
+
+@view_fragment
 def dashboard_tab():
     st.header("📊 Team Dashboard")
-    if st.session_state.logs:
-        col1, col2, col3, col4 = st.columns(4)
+    rollups = get_log_state().rollups
+    days = rollups.days()
+    if days:
+        start_day, end_day = days[0], days[-1]
+        colR, colG = st.columns([2, 1])
+        with colR:
+            if len(days) > 1:
+                # The span is part of the key: a keyed widget keeps its old value and bounds
+                # when they change, so a new day of logs would otherwise stay out of range.
+                picked = st.date_input("📆 Date range", value=(day_to_date(start_day), day_to_date(end_day)),
+                                       min_value=day_to_date(start_day), max_value=day_to_date(end_day),
+                                       key=f"dashboard-range-{start_day}-{end_day}")
+                if len(picked) == 2:  # a single date while the range is still being picked
+                    start_day, end_day = date_to_day(picked[0]), date_to_day(picked[1])
+        with colG:
+            granularity = st.radio("📅 Progress by", ["Day", "Hour"], horizontal=True, key="dashboard-granularity")
+
+        totals = rollups.totals(start_day, end_day)
+        total_logs = sum(count for count, _ in totals.values())
+        total_time = sum(minutes for _, minutes in totals.values())
+        completed_tasks = sum(count for (_, status), (count, _) in totals.items() if status == 'Completed')
 
-        total_logs = len(st.session_state.logs)
-        total_time = sum(log['time_spent'] for log in st.session_state.logs)
-        completed_tasks = len([log for log in st.session_state.logs if log['status'] == 'Completed'])
+        col1, col2, col3, col4 = st.columns(4)
 
         with col1:
             st.markdown(f"""<div class="stats-card"><h3>📋 {total_logs}</h3><p>Total Tasks</p></div>""", unsafe_allow_html=True)
@@ -314,29 +874,20 @@ def dashboard_tab():
 
         st.divider()
 
-        df = pd.DataFrame(st.session_state.logs)
+        if not totals:
+            st.info("No logs in this date range.")
+            return
+        with _profiler().span("dashboard.figures"):
+            fig_pie, fig_bar, fig_timeline = _dashboard_figures(
+                st.session_state.log_cursor, start_day, end_day, granularity == "Hour", rollups, totals)
         colA, colB = st.columns(2)
 
         with colA:
-            df['member_role'] = df['member'].map(lambda x: f"{x} ({TEAM_MEMBERS[x]})")
-            time_by_member = df.groupby('member_role')['time_spent'].sum()
-            fig_pie = px.pie(values=time_by_member.values, names=time_by_member.index, title="⏰ Time Distribution by Member",
-                             color_discrete_sequence=px.colors.qualitative.Set3)
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
             st.plotly_chart(fig_pie, use_container_width=True)
 
         with colB:
-            status_counts = df['status'].value_counts()
-            colors = {'Completed': '#4caf50', 'In Progress': '#ff9800', 'Not Started': '#f44336', 'Blocked': '#9c27b0'}
-            fig_bar = px.bar(x=status_counts.index, y=status_counts.values, title="📈 Task Status Overview",
-                             color=status_counts.index, color_discrete_map=colors)
-            fig_bar.update_layout(showlegend=False)
             st.plotly_chart(fig_bar, use_container_width=True)
 
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        daily_member_tasks = df.groupby([df['timestamp'].dt.date, 'member']).size().unstack(fill_value=0)
-        fig_timeline = px.line(daily_member_tasks, title="📅 Daily Progress by Member", markers=True)
-        fig_timeline.update_layout(xaxis_title="Date", yaxis_title="Tasks Completed", legend_title="Team Member")
         st.plotly_chart(fig_timeline, use_container_width=True)
 
     else:
@@ -347,78 +898,99 @@ def dashboard_tab():
         </div>
         """, unsafe_allow_html=True)
 
+def render_log_card(log: LogRecord):
+    status_emoji = {"Not Started": "⭕", "In Progress": "🔄", "Completed": "✅", "Blocked": "🚫"}
+    role = log.get('role', 'Unknown Role')
+    task_type = log.get('task_type', 'Custom')
+    task_badge = "🎯" if task_type in ["Assigned Duty", "Assigned Task"] else "🔧"
+    linked = f" <em>(Linked: {log['linked_task_id']})</em>" if log.get('linked_task_id') else ""
+
+    st.markdown(f"""
+    <div class="log-entry">
+        <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;'>
+            <h3 style='margin: 0; color: #1565c0;'>{status_emoji[log['status']]} {log['task']}{linked}</h3>
+            <span style='background: #e3f2fd; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 14px; color: #1565c0;'>
+                {task_badge} {task_type}
+            </span>
+        </div>
+        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem; margin-bottom: 1rem;'>
+            <div><strong>👤 Member:</strong> {log['member']} ({role})</div>
+            <div><strong>⏰ Time:</strong> {log['time_spent']} minutes</div>
+            <div><strong>📅 Date:</strong> {format_timestamp(log['timestamp'])}</div>
+            <div><strong>📈 Status:</strong> <span class='task-status status-{log['status'].lower().replace(' ', '-')}'>{log['status']}</span></div>
+        </div>
+        <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px;'>
+            <strong>📝 Notes:</strong> {log['notes'] if log['notes'] else '<em>No additional notes provided</em>'}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def log_archive_section():
+    """Seal old logs into an archive segment, and page through sealed segments from disk."""
+    segments = get_archive().segments(int(get_store().get_meta(ARCHIVED_THROUGH, "0")))
+    sealed = sum(segment.summary["count"] for segment in segments)
+    with st.expander(f"🗄 Archived logs ({sealed} entries in {len(segments)} segments)"):
+        st.caption("Archived entries still count in the stats and dashboard, but not in the filters and search above.")
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            days = st.number_input("Seal logs older than (days)", min_value=0, value=ARCHIVE_AFTER_DAYS, step=1)
+        with col2:
+            if st.button("🗄 Seal into a segment"):
+                horizon = epoch_seconds(datetime.datetime.now() - datetime.timedelta(days=days))
+                segment = get_archive().seal(get_store(), horizon)
+                if segment is None:
+                    st.info("No logs older than that to seal.")
+                else:
+                    st.toast(f"Sealed {segment.summary['count']} log entries.")
+                    _reset_log_state()
+                    st.rerun()
+        if segments:
+            labels = {
+                f"#{s.first_seq}–{s.last_seq} · {format_timestamp(s.summary['first_timestamp'])[:10]} → "
+                f"{format_timestamp(s.summary['last_timestamp'])[:10]} · {s.summary['count']} entries": s
+                for s in reversed(segments)
+            }
+            choice = st.selectbox("Browse a segment", list(labels), index=None, placeholder="Pick a segment")
+            if choice is not None:
+                for log in paginate(labels[choice].reader(), "archive"):
+                    render_log_card(log)
+
+@view_fragment
 def all_logs_tab():
     st.header("📋 Complete Log History")
-    if st.session_state.logs:
+    if get_log_state().logs:
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             filter_member = st.selectbox("👤 Filter by Member:", ["All"] + list(TEAM_MEMBERS.keys()))
         with col2:
-            filter_status = st.selectbox("📈 Filter by Status:", ["All", "Not Started", "In Progress", "Completed", "Blocked"])
+            filter_status = st.selectbox("📈 Filter by Status:", ["All"] + LOG_STATUSES)
         with col3:
-            filter_task_type = st.selectbox("📋 Filter by Task Type:", ["All", "Assigned Duty", "Assigned Task", "Custom"])
+            filter_task_type = st.selectbox("📋 Filter by Task Type:", ["All"] + LOG_TASK_TYPES)
         with col4:
             sort_by = st.selectbox("🔄 Sort by:", ["Timestamp (Latest)", "Timestamp (Oldest)", "Member", "Status"])
+        search = st.text_input("🔎 Search tasks and notes:", placeholder="e.g. blocker, judg 42, सारांश")
 
-        filtered_logs = st.session_state.logs.copy()
-        if filter_member != "All":
-            filtered_logs = [l for l in filtered_logs if l['member'] == filter_member]
-        if filter_status != "All":
-            filtered_logs = [l for l in filtered_logs if l['status'] == filter_status]
-        if filter_task_type != "All":
-            filtered_logs = [l for l in filtered_logs if l.get('task_type', 'Custom') == filter_task_type]
-
-        if sort_by == "Timestamp (Latest)":
-            filtered_logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        elif sort_by == "Timestamp (Oldest)":
-            filtered_logs.sort(key=lambda x: x['timestamp'])
-        elif sort_by == "Member":
-            filtered_logs.sort(key=lambda x: x['member'])
-        else:  # Status
-            filtered_logs.sort(key=lambda x: x['status'])
-
-        st.write(f"*Showing {len(filtered_logs)} of {len(st.session_state.logs)} log entries*")
-
-        for log in filtered_logs:
-            status_emoji = {"Not Started": "⭕", "In Progress": "🔄", "Completed": "✅", "Blocked": "🚫"}
-            role = log.get('role', 'Unknown Role')
-            task_type = log.get('task_type', 'Custom')
-            task_badge = "🎯" if task_type in ["Assigned Duty", "Assigned Task"] else "🔧"
-            linked = f" <em>(Linked: {log['linked_task_id']})</em>" if log.get('linked_task_id') else ""
-
-            st.markdown(f"""
-            <div class="log-entry">
-                <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;'>
-                    <h3 style='margin: 0; color: #1565c0;'>{status_emoji[log['status']]} {log['task']}{linked}</h3>
-                    <span style='background: #e3f2fd; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 14px; color: #1565c0;'>
-                        {task_badge} {task_type}
-                    </span>
-                </div>
-                <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem; margin-bottom: 1rem;'>
-                    <div><strong>👤 Member:</strong> {log['member']} ({role})</div>
-                    <div><strong>⏰ Time:</strong> {log['time_spent']} minutes</div>
-                    <div><strong>📅 Date:</strong> {log['timestamp']}</div>
-                    <div><strong>📈 Status:</strong> <span class='task-status status-{log['status'].lower().replace(' ', '-')}'>{log['status']}</span></div>
-                </div>
-                <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px;'>
-                    <strong>📝 Notes:</strong> {log['notes'] if log['notes'] else '<em>No additional notes provided</em>'}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        with _profiler().span("all_logs.query"):
+            filtered_logs = query_logs({'member': filter_member, 'status': filter_status, 'task_type': filter_task_type},
+                                       sort_by, search)
+
+        st.write(f"*Showing {len(filtered_logs)} of {len(get_log_state().logs)} log entries*")
+
+        for log in paginate(filtered_logs, "all-logs"):
+            render_log_card(log)
     else:
         st.info("📝 No logs to display yet! Start by adding your first log entry.")
+    log_archive_section()
 
 def team_progress_tab():
     st.header("👥 Individual Team Progress")
-    if st.session_state.logs:
+    if get_log_state().member_stats:
         cols = st.columns(2)
         for i, (member, role) in enumerate(TEAM_MEMBERS.items()):
             stats = get_member_stats(member)
             with cols[i % 2]:
                 assigned_duties = len(st.session_state.member_duties.get(member, []))
-                completed_duties = len([l for l in st.session_state.logs
-                                        if l['member'] == member and l['status'] == 'Completed'
-                                        and l.get('task_type') in ('Assigned Duty','Assigned Task')])
+                completed_duties = stats['completed_duties']
                 duty_progress = (completed_duties / assigned_duties * 100) if assigned_duties else 0
 
                 st.markdown(f"""
@@ -437,7 +1009,7 @@ def team_progress_tab():
                 </div>
                 """, unsafe_allow_html=True)
 
-                member_logs = [l for l in st.session_state.logs if l['member'] == member][-4:]
+                member_logs = get_log_state().logs_by_member.get(member, [])[-4:]
                 if member_logs:
                     st.write(f"📋 Recent Activity for {member}:")
                     for l in reversed(member_logs):
@@ -455,224 +1027,366 @@ def team_progress_tab():
     else:
         st.info("📊 No data available for team stats! Start logging your progress to see individual statistics.")
 
-def member_tabs(username: str):
-    header_and_banner()
-    sidebar_block(is_leader=False)
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 Add Log Entry", "📊 Dashboard", "📋 View My Logs", "🗂 My Assigned Tasks"])
-
-    # ---- Add Log Entry
-    with tab1:
-        st.header("🚀 Log Your Progress")
-        col1, col2 = st.columns(2)
-        with col1:
-            task_type = st.radio("📋 Task Type:", ["Assigned Duty", "Assigned Task", "Custom Task"])
-            if task_type == "Assigned Duty":
-                duties = st.session_state.member_duties.get(username, [])
-                task_description = st.selectbox("Select Duty:", duties) if duties else st.text_input("No predefined duty found. Enter task:")
-                linked_task_id = None
-            elif task_type == "Assigned Task":
-                my_tasks = [t for t in st.session_state.tasks if t["member"] == username and t["status"] in ("Assigned","In Progress","Completed") and not t["approved"]]
-                if my_tasks:
-                    chosen = st.selectbox("Select Assigned Task:", [f"{t['id']} | {t['task']} (due {t['deadline']})" for t in my_tasks])
-                    chosen_id = chosen.split(" | ")[0]
-                    chosen_task = next(t for t in my_tasks if t["id"] == chosen_id)
-                    task_description = chosen_task["task"]
-                    linked_task_id = chosen_task["id"]
+DEADLINE_ALERT_LABELS = {"overdue": "⏰ Overdue", "due_soon": "📅 Due soon", "at_risk": "⚠️ At risk (not started)"}
+
+def deadline_panel():
+    """Overdue, due-soon and at-risk open tasks, read off the deadline index."""
+    import pandas as pd
+    c1, c2, c3, c4 = st.columns(4)
+    with c4:
+        within_hours = st.number_input("Due within (hours)", min_value=1, max_value=24 * 14, value=48, step=12,
+                                       key="deadline-hours")
+    with _profiler().span("deadlines.alerts"):
+        alerts = deadline_alerts(epoch_seconds(datetime.datetime.now()), within_hours)
+    for col, (name, tasks) in zip((c1, c2, c3), alerts.items()):
+        col.metric(DEADLINE_ALERT_LABELS[name], len(tasks))
+    for name, tasks in alerts.items():
+        if tasks:
+            with st.expander(f"{DEADLINE_ALERT_LABELS[name]} ({len(tasks)})"):
+                st.dataframe(pd.DataFrame([{"ID": t["id"], "Task": t["task"], "Member": t["member"],
+                                            "Deadline": t["deadline"], "Status": t["status"]} for t in tasks]),
+                             hide_index=True)
+
+@view_fragment
+def tasks_approvals_tab():
+    import pandas as pd
+    st.subheader("🗂 All Assigned Tasks")
+    deadline_panel()
+    if not st.session_state.tasks:
+        st.info("No tasks have been assigned yet.")
+    else:
+        # Filters
+        f1, f2, f3 = st.columns(3)
+        with f1:
+            f_member = st.selectbox("Filter by Member", ["All"] + [m for m in TEAM_MEMBERS.keys() if m!="Member 4"])
+        with f2:
+            f_status = st.selectbox("Filter by Status", ["All"] + TASK_STATUSES)
+        with f3:
+            f_approved = st.selectbox("Filter by Approval", ["All", "Approved", "Pending"])
+
+        tasks = find_tasks(None if f_member == "All" else f_member,
+                           None if f_status == "All" else [f_status])
+        if f_approved != "All":
+            want = (f_approved == "Approved")
+            tasks = [t for t in tasks if t["approved"] == want]
+
+        tasks = tasks_for_review(tasks)
+        # Keyed on the filters and the task version, so a selection never
+        # outlives the rows it was made on.
+        table_key = f"task-table-{f_member}-{f_status}-{f_approved}-{st.session_state.task_cursor}"
+        selection = st.dataframe(
+            pd.DataFrame([{"ID": t["id"], "Task": t["task"], "Member": t["member"], "Deadline": t["deadline"],
+                           "Status": t["status"], "Approved": t["approved"]} for t in tasks]),
+            hide_index=True, on_select="rerun", selection_mode="multi-row", key=table_key)
+        select_all = st.checkbox(f"Select all {len(tasks)} listed task(s)")
+        selected = tasks if select_all else [tasks[i] for i in selection.selection.rows]
+
+        a1, a2, a3 = st.columns(3)
+        with a1:
+            action = st.selectbox("Bulk action", TASK_BULK_ACTIONS)
+        with a2:
+            new_member = new_deadline = None
+            if action == "Reassign":
+                new_member = st.selectbox("Reassign to", [m for m in TEAM_MEMBERS.keys() if m != "Member 4"])
+            elif action == "Move deadline":
+                new_deadline = st.date_input("New deadline", value=datetime.date.today() + datetime.timedelta(days=1))
+        with a3:
+            if st.button(f"Apply to {len(selected)} selected", type="primary", disabled=not selected):
+                changed = apply_task_action(action, selected, member=new_member, deadline=new_deadline)
+                if changed is None:
+                    st.warning(TASK_CONFLICT_MESSAGE)
                 else:
-                    st.info("No active assigned tasks. Use Custom/Duty.")
-                    task_description = st.text_input("📝 Task Description:")
-                    linked_task_id = None
+                    st.toast(f"{action}: {changed} of {len(selected)} selected task(s) changed.")
+                    rerun_view()
+    task_history_section()
+
+TASK_HISTORY_IGNORED_FIELDS = {"version", "updated_at"}
+
+def task_changes(history: List) -> List[Dict]:
+    """One row per recorded write of a task, naming the fields it changed."""
+    rows, previous = [], None
+    for _, at, _, task in history:
+        if task is None:
+            change = "deleted"
+        elif previous is None:
+            change = "created"
+        else:
+            change = ", ".join(f for f in task if f not in TASK_HISTORY_IGNORED_FIELDS and task.get(f) != previous.get(f))
+        shown = task or previous or {}
+        rows.append({"When": format_timestamp(at), "Change": change, "Member": shown.get("member"),
+                     "Status": shown.get("status"), "Deadline": shown.get("deadline"), "Approved": shown.get("approved")})
+        previous = task
+    return rows
+
+def task_history_section():
+    """Tasks as they stood at a past moment, and the recorded changes to one task."""
+    import pandas as pd
+    with st.expander("🕰 Task history"):
+        h1, h2, h3 = st.columns(3)
+        with h1:
+            day = st.date_input("As of", value=datetime.date.today(), key="history-day")
+        with h2:
+            at_time = st.time_input("Time", value=datetime.time(23, 59), key="history-time")
+        with h3:
+            overdue_only = st.checkbox("Overdue only", key="history-overdue")
+        at = epoch_seconds(datetime.datetime.combine(day, at_time))
+        with _profiler().span("task_history.tasks_at"):
+            tasks = list(get_store().tasks_at(at).values())
+        if overdue_only:
+            tasks = [t for t in tasks if t.get("deadline") and t["deadline"] < day and t["status"] not in ("Completed", "Approved")]
+        st.caption(f"{len(tasks)} task(s) as of {format_timestamp(at)}.")
+        if tasks:
+            st.dataframe(pd.DataFrame([{"ID": t["id"], "Task": t["task"], "Member": t["member"], "Deadline": t["deadline"],
+                                        "Status": t["status"], "Approved": t["approved"]}
+                                       for t in sorted(tasks, key=lambda t: t["id"])]), hide_index=True)
+
+        task_id = st.text_input("Changes to task", placeholder="Task ID, e.g. TASK-12", key="history-task")
+        if task_id:
+            history = get_store().task_history(task_id.strip())
+            if history:
+                st.dataframe(pd.DataFrame(task_changes(history)), hide_index=True)
+            else:
+                st.info(f"No recorded changes for {task_id}.")
+
+@view_fragment
+def add_log_form(username: str):
+    st.header("🚀 Log Your Progress")
+    col1, col2 = st.columns(2)
+    with col1:
+        task_type = st.radio("📋 Task Type:", LOG_TASK_TYPES, format_func=lambda t: "Custom Task" if t == "Custom" else t)
+        if task_type == "Assigned Duty":
+            duties = st.session_state.member_duties.get(username, [])
+            task_description = st.selectbox("Select Duty:", duties) if duties else st.text_input("No predefined duty found. Enter task:")
+            linked_task_id = None
+        elif task_type == "Assigned Task":
+            my_tasks = [t for t in find_tasks(username, ["Assigned","In Progress","Completed"]) if not t["approved"]]
+            if my_tasks:
+                chosen = st.selectbox("Select Assigned Task:", [f"{t['id']} | {t['task']} (due {t['deadline']})" for t in my_tasks])
+                chosen_id = chosen.split(" | ")[0]
+                chosen_task = get_task(chosen_id)
+                task_description = chosen_task["task"]
+                linked_task_id = chosen_task["id"]
             else:
+                st.info("No active assigned tasks. Use Custom/Duty.")
                 task_description = st.text_input("📝 Task Description:")
                 linked_task_id = None
-
-            status = st.selectbox("📈 Status:", ["Not Started", "In Progress", "Completed", "Blocked"])
-        with col2:
-            time_spent = st.number_input("⏱ Time Spent (minutes):", min_value=0, value=30, step=15)
-            notes = st.text_area("📋 Notes/Details/Challenges:", height=120, placeholder="Describe what you accomplished, blockers, next steps...")
-
-        if st.button("➕ Add Log Entry", type="primary", use_container_width=True):
-            if task_description and task_description.strip():
-                add_log_entry(username, task_description, status, time_spent, notes,
-                              task_type="Assigned Task" if linked_task_id else task_type,
-                              linked_task_id=linked_task_id)
+        else:
+            task_description = st.text_input("📝 Task Description:")
+            linked_task_id = None
+
+        status = st.selectbox("📈 Status:", LOG_STATUSES)
+    with col2:
+        time_spent = st.number_input("⏱ Time Spent (minutes):", min_value=0, max_value=MAX_TIME_SPENT, value=30, step=15)
+        notes = st.text_area("📋 Notes/Details/Challenges:", height=120, placeholder="Describe what you accomplished, blockers, next steps...")
+
+    if st.button("➕ Add Log Entry", type="primary", use_container_width=True):
+        if task_description and task_description.strip():
+            if add_log_entry(username, task_description, status, time_spent, notes,
+                             task_type="Assigned Task" if linked_task_id else task_type,
+                             linked_task_id=linked_task_id):
                 st.success("✅ Log entry added!")
                 st.balloons()
-                st.rerun()
-            else:
-                st.error("❌ Please enter a task description!")
-
-    with tab2:
-        dashboard_tab()
-
-    with tab3:
-        if st.session_state.logs:
-            my_logs = [l for l in st.session_state.logs if l['member'] == username]
-            if not my_logs:
-                st.info("No logs yet — add one in the first tab.")
             else:
-                for log in sorted(my_logs, key=lambda x: x['timestamp'], reverse=True):
-                    status_emoji = {"Not Started":"⭕","In Progress":"🔄","Completed":"✅","Blocked":"🚫"}
-                    linked = f" <em>(Linked: {log['linked_task_id']})</em>" if log.get('linked_task_id') else ""
-                    st.markdown(f"""
-                    <div class="log-entry">
-                        <div style='display:flex;justify-content:space-between;align-items:center;margin-bottom:1rem;'>
-                            <h3 style='margin:0;color:#1565c0;'>{status_emoji[log['status']]} {log['task']}{linked}</h3>
-                            <span style='background:#e3f2fd;padding:0.3rem 0.8rem;border-radius:15px;font-size:14px;color:#1565c0;'>{log.get('task_type','Custom')}</span>
-                        </div>
-                        <div>⏰ {log['time_spent']} min | 📅 {log['timestamp']} | 📈 {log['status']}</div>
-                        <div style='background:#f8f9fa;padding:1rem;border-radius:8px;margin-top:0.7rem;'><strong>📝 Notes:</strong> {log['notes'] or '<em>-</em>'}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.warning(LINKED_TASK_CONFLICT_MESSAGE)
+        else:
+            st.error("❌ Please enter a task description!")
+
+@view_fragment
+def my_logs_tab(username: str):
+    log_state = get_log_state()
+    if log_state.logs:
+        my_logs = log_state.logs_by_member.get(username, [])
+        if not my_logs:
+            st.info("No logs yet — add one in the first tab.")
         else:
-            st.info("No logs yet.")
+            for log in paginate(latest_first(my_logs), "my-logs"):
+                status_emoji = {"Not Started":"⭕","In Progress":"🔄","Completed":"✅","Blocked":"🚫"}
+                linked = f" <em>(Linked: {log['linked_task_id']})</em>" if log.get('linked_task_id') else ""
+                st.markdown(f"""
+                <div class="log-entry">
+                    <div style='display:flex;justify-content:space-between;align-items:center;margin-bottom:1rem;'>
+                        <h3 style='margin:0;color:#1565c0;'>{status_emoji[log['status']]} {log['task']}{linked}</h3>
+                        <span style='background:#e3f2fd;padding:0.3rem 0.8rem;border-radius:15px;font-size:14px;color:#1565c0;'>{log.get('task_type','Custom')}</span>
+                    </div>
+                    <div>⏰ {log['time_spent']} min | 📅 {format_timestamp(log['timestamp'])} | 📈 {log['status']}</div>
+                    <div style='background:#f8f9fa;padding:1rem;border-radius:8px;margin-top:0.7rem;'><strong>📝 Notes:</strong> {log['notes'] or '<em>-</em>'}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    else:
+        st.info("No logs yet.")
+
+@view_fragment
+def my_tasks_tab(username: str):
+    st.subheader("🗂 Assigned Tasks")
+    my_tasks = find_tasks(username)
+    if not my_tasks:
+        st.info("You have no assigned tasks yet.")
+    else:
+        for t in tasks_for_review(my_tasks):
+            st.write(f"**{t['id']}** — {t['task']}  \n"
+                     f"Deadline: `{t['deadline']}` | Status: **{t['status']}** | Approved: **{t['approved']}**")
+            if t["status"] in ("Assigned","In Progress"):
+                if st.button(f"Mark In Progress ({t['id']})", key=f"mip-{t['id']}"):
+                    if update_task(t, status="In Progress"):
+                        rerun_view()
+                    st.warning(TASK_CONFLICT_MESSAGE)
+                if st.button(f"Mark Completed ({t['id']})", key=f"mc-{t['id']}"):
+                    if update_task(t, status="Completed"):
+                        rerun_view()
+                    st.warning(TASK_CONFLICT_MESSAGE)
+            st.divider()
 
-    with tab4:
-        st.subheader("🗂 Assigned Tasks")
-        my_tasks = [t for t in st.session_state.tasks if t["member"] == username]
-        if not my_tasks:
-            st.info("You have no assigned tasks yet.")
+def member_tabs(username: str):
+    header_and_banner()
+    with _profiler().span("sidebar"):
+        sidebar_block(is_leader=False)
+    tab1, tab2, tab3, tab4 = lazy_tabs(["📝 Add Log Entry", "📊 Dashboard", "📋 View My Logs", "🗂 My Assigned Tasks"], "member-tabs")
+    render_tab(tab1, "add_log_tab", add_log_form, username)
+    render_tab(tab2, "dashboard_tab", dashboard_tab)
+    render_tab(tab3, "my_logs_tab", my_logs_tab, username)
+    render_tab(tab4, "my_tasks_tab", my_tasks_tab, username)
+
+@view_fragment
+def bulk_assign_section():
+    import pandas as pd
+    st.subheader("📝 Assign Tasks (Bulk)")
+    c1, c2 = st.columns([2,1])
+    with c1:
+        members = st.multiselect("Assign to members:", [m for m in TEAM_MEMBERS.keys() if m != "Member 4"], default=["Arryan","Arth","Shashwat"])
+        bulk_tasks_text = st.text_area("Enter one task per line:", height=120,
+                                       placeholder="e.g.\nFetch 50 judgments from Indian Kanoon\nDesign DB schema for case metadata\nBuild endpoint for doc upload ...")
+    with c2:
+        deadline = st.date_input("📅 Default Deadline", value=datetime.date.today() + datetime.timedelta(days=2))
+        assignment_mode = st.selectbox("⚖️ Balance by", ASSIGNMENT_MODES)
+        create_tasks = st.button("📌 Create Tasks", type="primary", use_container_width=True)
+
+    lines = [l.strip() for l in bulk_tasks_text.splitlines() if l.strip()]
+    plan = []
+    if lines and members:
+        plan = balanced_assignment(len(lines), *assignment_loads(assignment_mode, members, deadline))
+        new_counts = {m: 0 for m in members}
+        for m in plan:
+            new_counts[m] += 1
+        st.caption(f"Preview: {len(lines)} task(s) across {len(members)} member(s)")
+        st.dataframe(pd.DataFrame([{
+            "Member": m,
+            "Open tasks": len(find_tasks(member=m, statuses=OPEN_TASK_STATUSES)),
+            "Logged time (min)": get_member_stats(m)['total_time'],
+            "New tasks": new_counts[m],
+        } for m in members]), hide_index=True)
+
+    if create_tasks:
+        if not plan:
+            st.error("Please enter at least one task and select members.")
         else:
-            for t in sorted(my_tasks, key=lambda x: (x['approved'], x['status']!="Approved", x.get("deadline") or datetime.date.today())):
-                st.write(f"**{t['id']}** — {t['task']}  \n"
-                         f"Deadline: `{t['deadline']}` | Status: **{t['status']}** | Approved: **{t['approved']}**")
-                if t["status"] in ("Assigned","In Progress"):
-                    if st.button(f"Mark In Progress ({t['id']})", key=f"mip-{t['id']}"):
-                        t["status"] = "In Progress"; t["updated_at"] = datetime.datetime.now(); st.rerun()
-                    if st.button(f"Mark Completed ({t['id']})", key=f"mc-{t['id']}"):
-                        t["status"] = "Completed"; t["updated_at"] = datetime.datetime.now(); st.rerun()
-                st.divider()
+            now = datetime.datetime.now()
+            new_tasks = [{
+                "id": task_id,
+                "member": assigned_to,
+                "task": task,
+                "deadline": deadline,
+                "status": "Assigned",
+                "approved": False,
+                "created_at": now,
+                "updated_at": now
+            } for task, assigned_to, task_id in zip(lines, plan, _new_ids("TASK", len(lines)))]
+            if _save_tasks(new_tasks):
+                st.success(f"✅ Created {len(lines)} tasks for {len(members)} member(s).")
+            else:
+                st.warning(TASK_CONFLICT_MESSAGE)
+
+@view_fragment
+def timeline_section():
+    import pandas as pd
+    st.subheader("🧭 Project Timeline (Milestones)")
+    t1, t2, t3 = st.columns(3)
+    with t1:
+        tl_title = st.text_input("Milestone Title")
+    with t2:
+        tl_start = st.date_input("Start", value=datetime.date.today())
+    with t3:
+        tl_end = st.date_input("End", value=datetime.date.today() + datetime.timedelta(days=1))
+    tl_notes = st.text_area("Notes (optional)", height=80)
+    milestones = st.session_state.milestone_index
+    if tl_end < tl_start:
+        st.warning("The milestone ends before it starts.")
+    elif overlaps := milestones.overlapping(tl_start, tl_end):
+        st.caption("Overlaps with: " + ", ".join(f"{m['title']} ({m['start']} → {m['end']})" for m in overlaps))
+    if st.button("➕ Add Milestone", disabled=tl_end < tl_start):
+        get_store().append_milestone({
+            "title": tl_title or "Untitled",
+            "start": tl_start,
+            "end": tl_end,
+            "notes": tl_notes
+        })
+        _sync_state()
+        st.success("Milestone added.")
+
+    if milestones:
+        current = milestones.on(datetime.date.today())
+        st.markdown("**Current phase:** " + (", ".join(m["title"] for m in current) or "none in progress today"))
+        tl_df = pd.DataFrame(list(milestones))
+        st.dataframe(tl_df)
+
+@view_fragment
+def log_import_section():
+    st.subheader("📥 Bulk Import Logs")
+    uploaded = st.file_uploader("CSV, JSON or NDJSON with member, task, status, time_spent "
+                                "(optional: timestamp, task_type, notes, linked_task_id)",
+                                type=["csv", "json", "ndjson", "jsonl"])
+    if uploaded is not None and uploaded.file_id != st.session_state.get("imported_file_id"):
+        try:
+            entries, rejected = validate_log_import(read_log_import(uploaded.name, uploaded.getvalue()), st.session_state.tasks)
+        except ValueError as e:
+            st.error(f"Could not read {uploaded.name}: {e}")
+        else:
+            st.write(f"{len(entries)} valid row(s), {len(rejected)} rejected.")
+            if len(rejected):
+                st.dataframe(rejected)
+            if entries and st.button(f"📥 Import {len(entries)} Log Entries", type="primary"):
+                linked_saved = add_log_entries(entries)
+                st.session_state.imported_file_id = uploaded.file_id
+                if not linked_saved:
+                    st.toast(LINKED_TASK_CONFLICT_MESSAGE)
+                rerun_view()
+
+def assign_tab():
+    bulk_assign_section()
+    st.markdown("---")
+    timeline_section()
+    st.markdown("---")
+    log_import_section()
 
 def leader_tabs():
     header_and_banner()
-    sidebar_block(is_leader=True)
+    with _profiler().span("sidebar"):
+        sidebar_block(is_leader=True)
 
-    tab_assign, tab_dashboard, tab_all_logs, tab_progress, tab_tasks = st.tabs(
-        ["📅 Assign & Timeline", "📊 Dashboard", "📋 View All Logs", "👥 Team Progress", "🗂 Tasks & Approvals"]
+    tab_assign, tab_dashboard, tab_all_logs, tab_progress, tab_tasks = lazy_tabs(
+        ["📅 Assign & Timeline", "📊 Dashboard", "📋 View All Logs", "👥 Team Progress", "🗂 Tasks & Approvals"], "leader-tabs"
     )
-
-    with tab_assign:
-        st.subheader("📝 Assign Tasks (Bulk / Round-Robin)")
-        c1, c2 = st.columns([2,1])
-        with c1:
-            members = st.multiselect("Assign to members:", [m for m in TEAM_MEMBERS.keys() if m != "Member 4"], default=["Arryan","Arth","Shashwat"])
-            bulk_tasks_text = st.text_area("Enter one task per line:", height=120,
-                                           placeholder="e.g.\nFetch 50 judgments from Indian Kanoon\nDesign DB schema for case metadata\nBuild endpoint for doc upload ...")
-        with c2:
-            deadline = st.date_input("📅 Default Deadline", value=datetime.date.today() + datetime.timedelta(days=2))
-            if st.button("📌 Create Tasks", type="primary", use_container_width=True):
-                lines = [l.strip() for l in bulk_tasks_text.splitlines() if l.strip()]
-                if not lines or not members:
-                    st.error("Please enter at least one task and select members.")
-                else:
-                    for i, task in enumerate(lines):
-                        assigned_to = members[i % len(members)]
-                        st.session_state.tasks.append({
-                            "id": _new_id("TASK"),
-                            "member": assigned_to,
-                            "task": task,
-                            "deadline": deadline,
-                            "status": "Assigned",
-                            "approved": False,
-                            "created_at": datetime.datetime.now(),
-                            "updated_at": datetime.datetime.now()
-                        })
-                    st.success(f"✅ Created {len(lines)} tasks for {len(members)} member(s).")
-
-        st.markdown("---")
-        st.subheader("🧭 Project Timeline (Milestones)")
-        t1, t2, t3 = st.columns(3)
-        with t1:
-            tl_title = st.text_input("Milestone Title")
-        with t2:
-            tl_start = st.date_input("Start", value=datetime.date.today())
-        with t3:
-            tl_end = st.date_input("End", value=datetime.date.today() + datetime.timedelta(days=1))
-        tl_notes = st.text_area("Notes (optional)", height=80)
-        if st.button("➕ Add Milestone"):
-            st.session_state.timeline.append({
-                "title": tl_title or "Untitled",
-                "start": tl_start,
-                "end": tl_end,
-                "notes": tl_notes
-            })
-            st.success("Milestone added.")
-
-        if st.session_state.timeline:
-            tl_df = pd.DataFrame(st.session_state.timeline)
-            st.dataframe(tl_df)
-
-    with tab_dashboard:
-        dashboard_tab()
-
-    with tab_all_logs:
-        all_logs_tab()
-
-    with tab_progress:
-        team_progress_tab()
-
-    with tab_tasks:
-        st.subheader("🗂 All Assigned Tasks")
-        if not st.session_state.tasks:
-            st.info("No tasks have been assigned yet.")
-        else:
-            # Filters
-            f1, f2, f3 = st.columns(3)
-            with f1:
-                f_member = st.selectbox("Filter by Member", ["All"] + [m for m in TEAM_MEMBERS.keys() if m!="Member 4"])
-            with f2:
-                f_status = st.selectbox("Filter by Status", ["All", "Assigned", "In Progress", "Completed", "Approved"])
-            with f3:
-                f_approved = st.selectbox("Filter by Approval", ["All", "Approved", "Pending"])
-
-            tasks = st.session_state.tasks
-            if f_member != "All":
-                tasks = [t for t in tasks if t["member"] == f_member]
-            if f_status != "All":
-                tasks = [t for t in tasks if t["status"] == f_status]
-            if f_approved != "All":
-                want = (f_approved == "Approved")
-                tasks = [t for t in tasks if t["approved"] == want]
-
-            for t in sorted(tasks, key=lambda x: (x["approved"], x["status"] != "Approved", x.get("deadline") or datetime.date.today())):
-                st.write(f"**{t['id']}** — {t['task']}  \n"
-                         f"👤 {t['member']} | 📅 Deadline: `{t['deadline']}` | 📈 Status: **{t['status']}** | ✅ Approved: **{t['approved']}**")
-
-                cA, cB, cC, cD = st.columns(4)
-                with cA:
-                    if t["status"] != "Approved" and st.button(f"Approve ({t['id']})", key=f"appr-{t['id']}"):
-                        t["status"] = "Approved"
-                        t["approved"] = True
-                        t["updated_at"] = datetime.datetime.now()
-                        st.success(f"Task {t['id']} approved.")
-                        st.rerun()
-                with cB:
-                    if t["status"] in ("Assigned","In Progress") and st.button(f"Mark Completed ({t['id']})", key=f"done-{t['id']}"):
-                        t["status"] = "Completed"
-                        t["updated_at"] = datetime.datetime.now()
-                        st.rerun()
-                with cC:
-                    if t["status"] != "Assigned" and st.button(f"Reset to Assigned ({t['id']})", key=f"reset-{t['id']}"):
-                        t["status"] = "Assigned"
-                        t["approved"] = False
-                        t["updated_at"] = datetime.datetime.now()
-                        st.rerun()
-                with cD:
-                    if st.button(f"❌ Delete ({t['id']})", key=f"del-{t['id']}"):
-                        st.session_state.tasks = [x for x in st.session_state.tasks if x["id"] != t["id"]]
-                        st.rerun()
-                st.divider()
+    render_tab(tab_assign, "assign_tab", assign_tab)
+    render_tab(tab_dashboard, "dashboard_tab", dashboard_tab)
+    render_tab(tab_all_logs, "all_logs_tab", all_logs_tab)
+    render_tab(tab_progress, "team_progress_tab", team_progress_tab)
+    render_tab(tab_tasks, "tasks_approvals_tab", tasks_approvals_tab)
 
 def main():
     user = st.session_state.current_user
-    if not user:
-        login_view()
-        return
-
-    if USERS[user]["is_leader"]:
-        leader_tabs()
-    else:
-        member_tabs(user)
+    # finally: st.rerun() and st.stop() leave through an exception
+    try:
+        if not user:
+            with _profiler().span("login_view"):
+                login_view()
+            _preload_heavy_modules()
+            return
+
+        if USERS[user]["is_leader"]:
+            leader_tabs()
+        else:
+            member_tabs(user)
+    finally:
+        _profiler().end_rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
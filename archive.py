@@ -0,0 +1,170 @@
+import json
+import mmap
+import os
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+from records import LogRecord, to_epoch
+from rollups import LogRollups, add_member_stats
+from storage import ARCHIVED_THROUGH, LogStore
+
+SEGMENT_SUFFIX = ".seg"
+
+
+def summarize(logs: List[LogRecord]) -> Dict:
+    """The precomputed totals a segment carries in place of its entries."""
+    member_stats: Dict[str, Dict] = {}
+    rollups = LogRollups()
+    for log in logs:
+        add_member_stats(member_stats, log)
+        rollups.add(log)
+    return {
+        "first_seq": logs[0].seq,
+        "last_seq": logs[-1].seq,
+        "count": len(logs),
+        "first_timestamp": min(log.timestamp for log in logs),
+        "last_timestamp": max(log.timestamp for log in logs),
+        "member_stats": member_stats,
+        "rollups": rollups.to_json(),
+    }
+
+
+class SegmentReader:
+    """Random access to a segment's entries through a read-only memory map.
+
+    Only the line offsets are kept in memory; each entry is decoded when it
+    is read. Supports ``len()``, indexing and slicing, so it can be paged
+    like a list.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Line starts of every entry plus the end of the last one; line 0 is the summary.
+        offsets = array("q")
+        pos = self._map.find(b"\n") + 1
+        while pos < len(self._map):
+            offsets.append(pos)
+            pos = self._map.find(b"\n", pos) + 1 or len(self._map)
+        offsets.append(len(self._map))
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _read(self, i: int) -> LogRecord:
+        return LogRecord(json.loads(self._map[self._offsets[i]:self._offsets[i + 1]]))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._read(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._read(index)
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for i in range(len(self)):
+            yield self._read(i)
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class Segment:
+    """One sealed, immutable segment file: a summary line, then one log per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.summary = json.loads(f.readline())
+        self._reader: Optional[SegmentReader] = None
+        self._rollups: Optional[LogRollups] = None
+
+    @property
+    def first_seq(self) -> int:
+        return self.summary["first_seq"]
+
+    @property
+    def last_seq(self) -> int:
+        return self.summary["last_seq"]
+
+    def rollups(self) -> LogRollups:
+        """The summary's rollups, parsed once and shared; merge them, don't modify them."""
+        if self._rollups is None:
+            self._rollups = LogRollups.from_json(self.summary["rollups"])
+        return self._rollups
+
+    def reader(self) -> SegmentReader:
+        """Map the file on first use; the entries are never loaded as a whole."""
+        if self._reader is None:
+            self._reader = SegmentReader(self.path)
+        return self._reader
+
+
+class LogArchive:
+    """The segment files in ``directory``, oldest first.
+
+    Sealing moves a prefix of the store's logs (by seq) into a new segment,
+    then drops them from the store and advances ``ARCHIVED_THROUGH``. A
+    segment written by a seal that never got that far is ignored, and is
+    deleted by the next seal, which rewrites those logs.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._segments: Dict[str, Segment] = {}
+        self._lock = threading.Lock()
+
+    def segments(self, archived_through: Optional[int] = None) -> List[Segment]:
+        """Segments on disk (picking up ones sealed by other processes), up to ``archived_through``."""
+        with self._lock:
+            segments = self._scan()
+        if archived_through is not None:
+            segments = [s for s in segments if s.last_seq <= archived_through]
+        return segments
+
+    def _scan(self) -> List[Segment]:
+        names = set(os.listdir(self.directory)) if os.path.isdir(self.directory) else set()
+        for name in list(self._segments):
+            if name not in names:  # an interrupted seal's segment, deleted by a later seal
+                del self._segments[name]
+        for name in sorted(names):
+            if name.endswith(SEGMENT_SUFFIX) and name not in self._segments:
+                self._segments[name] = Segment(os.path.join(self.directory, name))
+        return sorted(self._segments.values(), key=lambda s: s.first_seq)
+
+    def seal(self, store: LogStore, before_timestamp: int) -> Optional[Segment]:
+        """Seal the oldest logs up to the first one logged at or after ``before_timestamp``.
+
+        Sealing stops at that log even if later ones are older (backfilled
+        imports), so the archive is always a seq prefix of the history.
+        """
+        with self._lock:
+            archived = int(store.get_meta(ARCHIVED_THROUGH, "0"))
+            logs = []
+            for seq, entry in store.logs_since(archived):
+                entry["seq"] = seq
+                if to_epoch(entry["timestamp"]) >= before_timestamp:
+                    break
+                logs.append(LogRecord(entry))
+            if not logs:
+                return None
+            for orphan in self._scan():
+                if orphan.first_seq > archived:
+                    os.remove(orphan.path)
+                    del self._segments[os.path.basename(orphan.path)]
+            summary = summarize(logs)
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"logs-{summary['first_seq']:010d}-{summary['last_seq']:010d}{SEGMENT_SUFFIX}"
+            path = os.path.join(self.directory, name)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(json.dumps(summary) + "\n")
+                for log in logs:
+                    f.write(json.dumps(log.to_dict(), ensure_ascii=False) + "\n")
+            os.replace(path + ".tmp", path)
+            store.archive_logs_through(summary["last_seq"])
+            segment = self._segments[name] = Segment(path)
+            return segment
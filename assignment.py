@@ -0,0 +1,20 @@
+import heapq
+from typing import Dict, List
+
+
+def balanced_assignment(count: int, loads: Dict[str, float], costs: Dict[str, float]) -> List[str]:
+    """Assign ``count`` new tasks one by one to the least loaded member.
+
+    ``loads`` is each member's current load and ``costs`` what one more
+    task adds to it. A heap keeps this at O(count log members); ties go to
+    the member listed first, so equal loads and costs give plain
+    round-robin.
+    """
+    heap = [(load, order, member) for order, (member, load) in enumerate(loads.items())]
+    heapq.heapify(heap)
+    plan = []
+    for _ in range(count if heap else 0):
+        load, order, member = heap[0]
+        plan.append(member)
+        heapq.heapreplace(heap, (load + costs[member], order, member))
+    return plan
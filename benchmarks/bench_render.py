@@ -0,0 +1,150 @@
+"""Headless render benchmarks for the tab renderers in app.py.
+
+Each size runs in a Streamlit ``AppTest`` session backed by an in-memory
+store filled with synthetic data; every renderer is timed and its peak
+traced allocation recorded, on a cold run and again on a rerun. Timings
+include tracemalloc overhead, so compare them only with each other.
+
+    python -m benchmarks.bench_render --sizes 1000 10000 --save benchmarks/baseline.json
+    python -m benchmarks.bench_render --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def _scenario(repo_root: str, n_logs: int, seed: int):
+    # Runs as the AppTest script, so it must be self-contained.
+    import sys
+    import time
+    import tracemalloc
+
+    import streamlit as st
+
+    sys.path.insert(0, repo_root)
+    import app
+    # The app imports these lazily (preloaded after login); import them up
+    # front so the first dashboard measures rendering, not module loading.
+    app._import_heavy_modules()
+    from benchmarks.synthetic import populate
+
+    results = st.session_state.get("bench_results", {})
+
+    def measure(name, fn):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"wall_s": round(wall, 4), "peak_kib": round(peak / 1024, 1)}
+
+    # Each renderer can only run once per script run (element ids), so the
+    # warm numbers come from a second run of this script.
+    if not results:
+        app.get_store.clear()
+        app.get_log_state.clear()
+        populate(app.get_store(), app.TEAM_MEMBERS, n_logs, seed)
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        app._init_state()
+        app._dashboard_figures.clear()
+
+        measure("sync_state (cold load)", app._sync_state)
+        # A second session: the decoded logs are shared, so it only pulls the new ones.
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+        app._init_state()
+        measure("sync_state (new session)", app._sync_state)
+        measure("dashboard_tab", app.dashboard_tab)
+        measure("all_logs_tab", app.all_logs_tab)
+        measure("team_progress_tab", app.team_progress_tab)
+        measure("tasks_approvals_tab", app.tasks_approvals_tab)
+        measure("export_to_google_docs_format", app.export_to_google_docs_format)
+    else:
+        measure("sync_state (rerun)", app._sync_state)
+        measure("dashboard_tab (rerun)", app.dashboard_tab)
+        measure("all_logs_tab (rerun)", app.all_logs_tab)
+        measure("export_to_google_docs_format (rerun)", app.export_to_google_docs_format)
+    st.session_state.bench_results = results
+
+
+def run(sizes, seed: int = 0, timeout: float = 1800):
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["HACKATHON_LOG_STORE"] = "memory://"
+    results = {}
+    for n in sizes:
+        at = AppTest.from_function(_scenario, args=(REPO_ROOT, n, seed), default_timeout=timeout)
+        for _ in range(2):  # cold run, then a rerun with unchanged data
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"benchmark at {n} logs failed: {at.exception[0].message}")
+        results[str(n)] = at.session_state.bench_results
+    return results
+
+
+def _environment():
+    import pandas
+    import plotly
+    import streamlit
+    return {
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "pandas": pandas.__version__,
+        "plotly": plotly.__version__,
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def compare(current, baseline, threshold: float):
+    """Print current vs baseline wall times; return the list of regressions."""
+    regressions = []
+    for size, functions in current.items():
+        for name, result in functions.items():
+            before = baseline.get(size, {}).get(name)
+            if not before:
+                print(f"{size:>7} {name:<34} {result['wall_s']:>9.4f}s   (no baseline)")
+                continue
+            ratio = result["wall_s"] / before["wall_s"] if before["wall_s"] else float("inf")
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{size:>7} {name:<34} {result['wall_s']:>9.4f}s  vs {before['wall_s']:>9.4f}s  x{ratio:.2f}{flag}")
+            if flag:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="log counts to benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="compare against a JSON baseline; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.seed)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+    else:
+        regressions = []
+        for size, functions in results.items():
+            for name, result in functions.items():
+                print(f"{size:>7} {name:<34} {result['wall_s']:>9.4f}s  {result['peak_kib']:>10.1f} KiB")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": _environment(), "results": results}, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Cold-start benchmark: import and first-render latency of app.py.
+
+Every run starts a fresh interpreter (in-memory store) and times importing
+Streamlit, rendering the login page, logging in as the leader and opening
+the dashboard; the median of ``--runs`` is reported per phase, along with
+the cost of importing pandas and Plotly on their own, and which of them
+the login page itself imported (rather than the background preload).
+
+    python -m benchmarks.bench_startup --runs 5 --save benchmarks/startup.json
+    python -m benchmarks.bench_startup --compare benchmarks/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_render import REPO_ROOT, _environment, compare
+
+HEAVY_MODULES = ("pandas", "plotly.express")
+
+
+class _ImportWatcher:
+    """Meta path hook noting which thread first imports each heavy module."""
+
+    def __init__(self):
+        self.threads = {}
+
+    def find_spec(self, name, path=None, target=None):
+        if name in HEAVY_MODULES:
+            import threading
+            self.threads.setdefault(name, threading.current_thread().name)
+        return None
+
+
+def _child_app():
+    import time
+    watcher = _ImportWatcher()
+    sys.meta_path.insert(0, watcher)
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    phases = {"import_streamlit": time.perf_counter() - start}
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    phases["login_render"] = time.perf_counter() - start
+    login_imports = sorted(m for m, thread in watcher.threads.items() if thread != "preload-imports")
+
+    at.text_input[0].input("Member 4")
+    at.text_input[1].input("leader")
+    at.button[0].click()
+    start = time.perf_counter()
+    at.run()
+    phases["first_leader_render"] = time.perf_counter() - start
+
+    at.session_state["leader-tabs"] = "📊 Dashboard"
+    start = time.perf_counter()
+    at.run()
+    phases["dashboard_render"] = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {"phases": phases, "login_imports": login_imports}
+
+
+def _child_imports():
+    import time
+    phases = {}
+    for module in HEAVY_MODULES:
+        start = time.perf_counter()
+        __import__(module)
+        phases[f"import_{module}"] = time.perf_counter() - start
+    return {"phases": phases, "login_imports": []}
+
+
+def _run_child(kind: str):
+    env = dict(os.environ, HACKATHON_LOG_STORE="memory://", HACKATHON_ARCHIVE_DIR=tempfile.mkdtemp())
+    out = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", kind], cwd=REPO_ROOT,
+                         env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(runs: int):
+    """Median seconds per phase, and the heavy modules the login page imported in any run."""
+    samples, login_imports = {}, set()
+    for _ in range(runs):
+        for kind in ("app", "imports"):
+            result = _run_child(kind)
+            login_imports.update(result["login_imports"])
+            for phase, seconds in result["phases"].items():
+                samples.setdefault(phase, []).append(seconds)
+    results = {"startup": {phase: {"wall_s": round(statistics.median(values), 4)} for phase, values in samples.items()}}
+    return results, sorted(login_imports)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to take the median over")
+    parser.add_argument("--save", help="write results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="compare against a JSON baseline; exits 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    parser.add_argument("--child", choices=["app", "imports"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child_app() if args.child == "app" else _child_imports()))
+        return 0
+
+    results, login_imports = run(args.runs)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+    else:
+        regressions = []
+        for phase, result in results["startup"].items():
+            print(f"{phase:<34} {result['wall_s']:>9.4f}s")
+    print(f"Imported by the login page: {', '.join(login_imports) or 'none of ' + ', '.join(HEAVY_MODULES)}")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"environment": _environment(), "results": results}, f, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Synthetic hackathon data for the benchmarks: logs, tasks and milestones
+shaped like what the app writes (same fields, statuses and id formats)."""
+import datetime
+import random
+from typing import Dict, List
+
+from records import epoch_seconds
+from storage import LogStore
+
+LOG_STATUSES = ["Not Started", "In Progress", "Completed", "Blocked"]
+LOG_STATUS_WEIGHTS = [1, 4, 6, 1]
+TASK_TYPES = ["Assigned Duty", "Assigned Task", "Custom"]
+TASK_STATUSES = ["Assigned", "In Progress", "Completed", "Approved"]
+
+_WORDS = [
+    "fetch", "judgments", "Indian", "Kanoon", "schema", "migration", "endpoint", "upload",
+    "clause", "segmentation", "summary", "risk", "liability", "penalty", "interest", "PDP",
+    "compliance", "blocked", "API", "rate", "limit", "metadata", "CSV", "JSON",
+    "अनुबंध", "धारा", "सारांश", "जोखिम", "हिंदी", "निर्णय", "दंड", "ब्याज",
+]
+
+SPRINT_START = datetime.datetime(2026, 1, 5, 9, 0, 0)
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def synthetic_tasks(n: int, members: List[str], seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        created = SPRINT_START + datetime.timedelta(minutes=rng.randrange(3 * 24 * 60))
+        status = rng.choice(TASK_STATUSES)
+        tasks.append({
+            "id": f"TASK-bench-{i}",
+            "member": members[i % len(members)],
+            "task": f"{_sentence(rng, 5)} #{i}",
+            "deadline": (created + datetime.timedelta(days=rng.randint(0, 3))).date(),
+            "status": status,
+            "approved": status == "Approved",
+            "created_at": created,
+            "updated_at": created,
+        })
+    return tasks
+
+
+def synthetic_logs(n: int, team: Dict[str, str], tasks: List[Dict], seed: int = 0) -> List[Dict]:
+    """``n`` logs spread evenly (and in timestamp order) over a 3-day sprint."""
+    rng = random.Random(seed)
+    members = list(team)
+    step = 3 * 24 * 3600 / max(n, 1)
+    start = epoch_seconds(SPRINT_START)
+    logs = []
+    for i in range(n):
+        member = rng.choice(members)
+        task_type = rng.choice(TASK_TYPES)
+        linked = rng.choice(tasks)["id"] if task_type == "Assigned Task" and tasks else None
+        logs.append({
+            "timestamp": start + int(i * step),
+            "member": member,
+            "role": team[member],
+            "task": _sentence(rng, 6),
+            "task_type": task_type,
+            "status": rng.choices(LOG_STATUSES, LOG_STATUS_WEIGHTS)[0],
+            "time_spent": 15 * rng.randint(0, 8),
+            "notes": _sentence(rng, rng.randint(0, 12)),
+            "linked_task_id": linked,
+        })
+    return logs
+
+
+def synthetic_timeline(n: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    milestones = []
+    for i in range(n):
+        start = SPRINT_START.date() + datetime.timedelta(days=rng.randint(0, 2))
+        milestones.append({
+            "title": f"Milestone {i}: {_sentence(rng, 3)}",
+            "start": start,
+            "end": start + datetime.timedelta(days=rng.randint(0, 2)),
+            "notes": _sentence(rng, 6),
+        })
+    return milestones
+
+
+def populate(store: LogStore, team: Dict[str, str], n_logs: int, seed: int = 0) -> None:
+    """Fill ``store`` with ``n_logs`` logs, ``n_logs // 10`` tasks and a few dozen milestones."""
+    members = [m for m in team if m != "Member 4"] or list(team)
+    tasks = synthetic_tasks(max(n_logs // 10, 1), members, seed)
+    store.put_tasks(tasks)
+    store.append_logs(synthetic_logs(n_logs, team, tasks, seed))
+    for milestone in synthetic_timeline(min(max(n_logs // 1000, 5), 50), seed):
+        store.append_milestone(milestone)
@@ -0,0 +1,101 @@
+import bisect
+import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from records import SECONDS_PER_DAY, date_to_day
+
+
+def creation_order(task_id: str) -> Tuple[int, str]:
+    """A sort key putting ids in creation order: ``TASK-10`` after ``TASK-9``.
+
+    Ids are numbered from a store-wide counter; any other id sorts first, by text.
+    """
+    number = task_id.rpartition("-")[2]
+    return (int(number), task_id) if number.isdigit() else (-1, task_id)
+
+
+def due_at(deadline: Optional[datetime.date]) -> Optional[int]:
+    """A deadline date as epoch seconds: the end of that day, on the same local clock as log timestamps."""
+    return None if deadline is None else (date_to_day(deadline) + 1) * SECONDS_PER_DAY
+
+
+class DeadlineIndex:
+    """Task ids kept sorted by due time as tasks are created, changed and deleted.
+
+    Range queries bisect into the order, so they cost O(log n + k) for k
+    results. Ties are in creation order (see ``creation_order``).
+    """
+
+    def __init__(self):
+        self._order: List[Tuple[int, Tuple[int, str]]] = []
+        self._keys: Dict[str, Tuple[int, Tuple[int, str]]] = {}
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[str]:
+        return (task_id for _, (_, task_id) in self._order)
+
+    def set(self, task_id: str, due: Optional[int]) -> None:
+        """File ``task_id`` under ``due``, or drop it when ``due`` is None."""
+        old = self._keys.pop(task_id, None)
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, old)]
+        if due is not None:
+            key = self._keys[task_id] = (due, creation_order(task_id))
+            bisect.insort(self._order, key)
+
+    def between(self, start: Optional[int], end: Optional[int]) -> List[str]:
+        """Ids due in ``[start, end)``, soonest first; ``None`` leaves that end open."""
+        low = 0 if start is None else bisect.bisect_left(self._order, (start,))
+        high = len(self._order) if end is None else bisect.bisect_left(self._order, (end,))
+        return [task_id for _, (_, task_id) in self._order[low:high]]
+
+
+class MilestoneIndex:
+    """Milestones as closed ``[start, end]`` date intervals, sorted by start.
+
+    Positions are grouped into buckets of ``BUCKET`` milestones that record
+    their latest end. An overlap query bisects to the last milestone starting
+    by the query's end and scans only the buckets that reach its start:
+    O(log n + n / BUCKET + BUCKET per bucket holding a match), so one long
+    early milestone costs one bucket scan rather than a walk over every
+    milestone after it.
+    """
+
+    BUCKET = 32
+
+    def __init__(self):
+        self._starts: List[datetime.date] = []
+        self._milestones: List[Dict] = []
+        self._bucket_reach: List[datetime.date] = []
+
+    def __len__(self):
+        return len(self._milestones)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._milestones)
+
+    def add(self, milestone: Dict) -> None:
+        position = bisect.bisect_right(self._starts, milestone["start"])
+        self._starts.insert(position, milestone["start"])
+        self._milestones.insert(position, milestone)
+        # Milestones are usually added in date order, so this rarely redoes more than the last bucket.
+        first = position // self.BUCKET
+        del self._bucket_reach[first:]
+        for b in range(first * self.BUCKET, len(self._milestones), self.BUCKET):
+            self._bucket_reach.append(max(m["end"] for m in self._milestones[b:b + self.BUCKET]))
+
+    def overlapping(self, start: datetime.date, end: datetime.date) -> List[Dict]:
+        """Milestones sharing at least one day with ``[start, end]``, by start date."""
+        found = []
+        stop = bisect.bisect_right(self._starts, end)
+        for b, reach in enumerate(self._bucket_reach[:(stop + self.BUCKET - 1) // self.BUCKET]):
+            if reach >= start:
+                found.extend(m for m in self._milestones[b * self.BUCKET:min(stop, (b + 1) * self.BUCKET)]
+                             if m["end"] >= start)
+        return found
+
+    def on(self, day: datetime.date) -> List[Dict]:
+        """The milestones in progress on ``day``: the current phase(s)."""
+        return self.overlapping(day, day)
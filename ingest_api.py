@@ -0,0 +1,356 @@
+"""Local HTTP ingestion API for scripts and bots.
+
+Writes logs and task status updates into the shared store from a separate
+process, so the Streamlit app picks them up on its sessions' next sync
+like any other session's writes. Point it at the same SQLite store as the
+app (``HACKATHON_LOG_STORE``); a ``memory://`` store would not be shared.
+
+    python ingest_api.py --port 8765
+
+    POST /logs          a log entry object, or a list of them
+    POST /tasks/status  {"id": "TASK-3", "status": "Completed"}, or a list of them
+    GET  /health
+
+Requests authenticate with HTTP Basic auth as one of ``USERS``. Members may
+write only their own logs and tasks; the leader may write anyone's. A
+request is applied whole or not at all: any invalid item rejects it with
+400 and a list of ``{"index", "error"}``. If a linked task keeps changing
+while its logs are written, the logs are still accepted and the response
+carries a ``warning`` that the task's status was not moved.
+
+Concurrent requests are coalesced: writes queue up for a few milliseconds
+(or until ``--max-batch`` items) and go to the store as one transaction.
+"""
+import argparse
+import asyncio
+import base64
+import datetime
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from records import MAX_TIMESTAMP, MIN_TIMESTAMP, epoch_seconds, to_epoch
+from storage import LogStore, TaskConflict, open_store
+from team import (LOG_STATUSES, LOG_TASK_TYPES, MAX_TIME_SPENT, OPEN_TASK_STATUSES, TASK_STATUSES, USERS,
+                  canonical_task_type, linked_task_status)
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_ITEMS_PER_REQUEST = 1000
+LINKED_TASK_NOT_UPDATED = "linked task status not updated: the task kept changing; set it via /tasks/status"
+# Statuses a member may set on their own open tasks; the leader may set any of TASK_STATUSES.
+MEMBER_TASK_STATUSES = ["In Progress", "Completed"]
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, body: Dict):
+        super().__init__(body)
+        self.status = status
+        self.body = body
+
+
+def authenticate(header: Optional[str]) -> str:
+    """The user named by a Basic ``Authorization`` header, if the password matches."""
+    try:
+        scheme, _, credentials = (header or "").partition(" ")
+        username, _, password = base64.b64decode(credentials).decode().partition(":")
+    except ValueError:  # bad base64, or credentials that are not ASCII/UTF-8
+        username = password = scheme = ""
+    if scheme.lower() != "basic" or username not in USERS or USERS[username]["password"] != password:
+        raise RequestError(401, {"error": "authentication required"})
+    return username
+
+
+def _may_write_for(user: str, member: str) -> bool:
+    return USERS[user]["is_leader"] or member == user
+
+
+def validate_log_entry(item, user: str, now: int) -> Tuple[Optional[Dict], Optional[str]]:
+    """``(entry, None)`` ready for the store, or ``(None, error)``; the same rules as the bulk import."""
+    if not isinstance(item, dict):
+        return None, "expected an object"
+    member = item.get("member", user)
+    task = str(item.get("task") or "").strip()
+    status = item.get("status")
+    task_type = canonical_task_type(item.get("task_type"))
+    time_spent = item.get("time_spent")
+    if not isinstance(member, str) or member not in USERS:
+        return None, "unknown member"
+    if not _may_write_for(user, member):
+        return None, "members may only log for themselves"
+    if not task:
+        return None, "empty task"
+    if status not in LOG_STATUSES:
+        return None, "invalid status"
+    if task_type not in LOG_TASK_TYPES:
+        return None, "invalid task_type"
+    if isinstance(time_spent, bool) or not isinstance(time_spent, int) or time_spent < 0:
+        return None, "time_spent must be a whole number of minutes >= 0"
+    if time_spent > MAX_TIME_SPENT:
+        return None, f"time_spent must be at most {MAX_TIME_SPENT} minutes"
+    linked_task_id = item.get("linked_task_id") or None
+    if linked_task_id is not None and not isinstance(linked_task_id, str):
+        return None, "linked_task_id must be a string"
+    try:
+        timestamp = to_epoch(item["timestamp"]) if item.get("timestamp") not in (None, "") else now
+    except (TypeError, ValueError, OverflowError):
+        return None, "unparseable timestamp"
+    if not MIN_TIMESTAMP <= timestamp <= MAX_TIMESTAMP:
+        return None, "unparseable timestamp"
+    return {
+        "timestamp": timestamp,
+        "member": member,
+        "role": USERS[member]["role"],
+        "task": task,
+        "task_type": task_type,
+        "status": status,
+        "time_spent": time_spent,
+        "notes": str(item.get("notes") or ""),
+        "linked_task_id": linked_task_id,
+    }, None
+
+
+def _status_changes(status: str) -> Dict:
+    # Mirrors the leader's Approve / Reset to Assigned actions in the app.
+    if status == "Approved":
+        return {"status": status, "approved": True}
+    if status == "Assigned":
+        return {"status": status, "approved": False}
+    return {"status": status}
+
+
+class IngestServer:
+    """Parses requests, validates them, and hands them to the batching writers."""
+
+    def __init__(self, store: LogStore, max_batch: int = 500, max_delay: float = 0.005):
+        self.store = store
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._logs: Optional[asyncio.Queue] = None
+        self._task_updates: Optional[asyncio.Queue] = None
+
+    async def serve(self, host: str, port: int) -> None:
+        self._logs, self._task_updates = asyncio.Queue(), asyncio.Queue()
+        writers = [asyncio.create_task(self._drain(self._logs, self._write_logs)),
+                   asyncio.create_task(self._drain(self._task_updates, self._write_task_updates))]
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"Ingestion API listening on http://{host}:{port}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for writer in writers:
+                writer.cancel()
+
+    # --- HTTP ---------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get("transfer-encoding", "identity").lower() != "identity":
+                    # Bodies are read by Content-Length only; a chunked one would be parsed as requests.
+                    await self._respond(writer, 411, {"error": "send the body with a Content-Length"}, keep_alive=False)
+                    break
+                length = int(headers.get("content-length") or 0)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, result = await self._route(method, path, headers, body)
+                except RequestError as e:
+                    status, result = e.status, e.body
+                await self._respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: Dict, keep_alive: bool) -> None:
+        payload = json.dumps(body).encode()
+        reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+                  405: "Method Not Allowed", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+                  500: "Internal Server Error"}.get(status, "")
+        head = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json",
+                f"Content-Length: {len(payload)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 401:
+            head.append('WWW-Authenticate: Basic realm="hackathon-log"')
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict]:
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path not in ("/logs", "/tasks/status"):
+            raise RequestError(404, {"error": f"no such endpoint: {path}"})
+        if method != "POST":
+            raise RequestError(405, {"error": "use POST"})
+        user = authenticate(headers.get("authorization"))
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise RequestError(400, {"error": "body is not valid JSON"})
+        items = payload if isinstance(payload, list) else [payload]
+        if not items or len(items) > MAX_ITEMS_PER_REQUEST:
+            raise RequestError(400, {"error": f"send between 1 and {MAX_ITEMS_PER_REQUEST} items"})
+        if path == "/logs":
+            return 200, await self._submit_logs(items, user)
+        return 200, await self._submit(self._task_updates, items, user)
+
+    async def _submit(self, queue: asyncio.Queue, items: List, user: str):
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((items, user, future))
+        return await future
+
+    async def _submit_logs(self, items: List, user: str) -> Dict:
+        now = epoch_seconds(datetime.datetime.now())
+        entries, errors = [], []
+        for i, item in enumerate(items):
+            entry, error = validate_log_entry(item, user, now)
+            if error:
+                errors.append({"index": i, "error": error})
+            entries.append(entry)
+        if not errors:
+            linked = {e["linked_task_id"] for e in entries if e["linked_task_id"]}
+            known = await asyncio.get_running_loop().run_in_executor(None, self.store.get_tasks, list(linked))
+            for i, entry in enumerate(entries):
+                error = self._linked_task_error(known.get(entry["linked_task_id"]), user) if entry["linked_task_id"] else None
+                if error:
+                    errors.append({"index": i, "error": error})
+        if errors:
+            raise RequestError(400, {"errors": errors})
+        return await self._submit(self._logs, entries, user)
+
+    @staticmethod
+    def _linked_task_error(task: Optional[Dict], user: str) -> Optional[str]:
+        # A linked log moves its task's status, so it needs the same rights as POST /tasks/status.
+        if task is None:
+            return "unknown linked_task_id"
+        if not _may_write_for(user, task["member"]):
+            return "members may only link their own tasks"
+        if not USERS[user]["is_leader"] and task["status"] not in OPEN_TASK_STATUSES:
+            return "linked task is no longer open"
+        return None
+
+    # --- batching writers ---------------------------------------------------
+
+    async def _drain(self, queue: asyncio.Queue, write) -> None:
+        """Wait ``max_delay`` after the first queued job for others to join, then write up to ``max_batch`` items in one go."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            await asyncio.sleep(self.max_delay)
+            size = len(batch[0][0])
+            while size < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+                size += len(batch[-1][0])
+            try:
+                results = await loop.run_in_executor(None, write, [(items, user) for items, user, _ in batch])
+            except Exception as e:
+                results = [RequestError(500, {"error": str(e)})] * len(batch)
+            for (_, _, future), result in zip(batch, results):
+                if future.done():  # the client went away
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _write_logs(self, jobs: List[Tuple[List[Dict], str]]) -> List[Dict]:
+        entries = [entry for items, _ in jobs for entry in items]
+        last_seq = self.store.append_logs(entries)
+        # One transaction per batch, so the batch's seqs are contiguous.
+        results, seq = [], last_seq - len(entries)
+        for items, _ in jobs:
+            seq += len(items)
+            results.append({"accepted": len(items), "last_seq": seq})
+
+        linked = [(entry, user) for items, user in jobs for entry in items if entry["linked_task_id"]]
+        for _ in range(3 if linked else 0):  # as in the app: retry if a linked task changes meanwhile
+            tasks = self.store.get_tasks([entry["linked_task_id"] for entry, _ in linked])
+            updated, now = {}, datetime.datetime.now()
+            for entry, user in linked:
+                task_id = entry["linked_task_id"]
+                task = updated.get(task_id) or tasks.get(task_id)
+                # Re-checked here in case the task was approved or deleted after the request was validated.
+                if task is not None and self._linked_task_error(task, user) is None:
+                    updated[task_id] = dict(task, status=linked_task_status(task["status"], entry["status"]),
+                                            updated_at=now)
+            try:
+                self.store.put_tasks(list(updated.values()))
+                break
+            except TaskConflict:
+                continue
+        else:
+            # The logs are stored either way; tell the clients whose linked tasks were left behind.
+            for (items, _), result in zip(jobs, results):
+                if any(entry["linked_task_id"] for entry in items):
+                    result["warning"] = LINKED_TASK_NOT_UPDATED
+        return results
+
+    def _write_task_updates(self, jobs: List[Tuple[List, str]]) -> List:
+        ids = [item.get("id") for items, _ in jobs for item in items if isinstance(item, dict)]
+        for _ in range(3):  # re-validate against a fresh read if a task changes meanwhile
+            tasks = self.store.get_tasks([task_id for task_id in ids if isinstance(task_id, str)])
+            results, updated, now = [], {}, datetime.datetime.now()
+            for items, user in jobs:
+                errors = []
+                for i, item in enumerate(items):
+                    task_id = item.get("id") if isinstance(item, dict) else None
+                    task = (updated.get(task_id) or tasks.get(task_id)) if isinstance(task_id, str) else None
+                    if task is None:
+                        errors.append({"index": i, "error": "unknown task id"})
+                    elif not _may_write_for(user, task["member"]):
+                        errors.append({"index": i, "error": "members may only update their own tasks"})
+                    elif item.get("status") not in (TASK_STATUSES if USERS[user]["is_leader"] else MEMBER_TASK_STATUSES):
+                        errors.append({"index": i, "error": "invalid status"})
+                    elif not USERS[user]["is_leader"] and task["status"] not in OPEN_TASK_STATUSES:
+                        errors.append({"index": i, "error": "task is no longer open"})
+                if errors:
+                    results.append(RequestError(400, {"errors": errors}))
+                    continue
+                for item in items:
+                    task = updated.get(item["id"]) or tasks[item["id"]]
+                    updated[item["id"]] = dict(task, **_status_changes(item["status"]), updated_at=now)
+                results.append({"updated": len(items)})
+            try:
+                self.store.put_tasks(list(updated.values()))
+                return results
+            except TaskConflict:
+                continue
+        return [RequestError(409, {"error": "tasks changed concurrently, try again"})] * len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get("HACKATHON_INGEST_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("HACKATHON_INGEST_PORT", "8765")))
+    parser.add_argument("--store", default=os.environ.get("HACKATHON_LOG_STORE", "sqlite:///hackathon_log.db"))
+    parser.add_argument("--max-batch", type=int, default=500, help="most queued items written in one transaction")
+    parser.add_argument("--max-delay-ms", type=float, default=5, help="how long a write waits for others to join it")
+    args = parser.parse_args(argv)
+    server = IngestServer(open_store(args.store), args.max_batch, args.max_delay_ms / 1000)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
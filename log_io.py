@@ -0,0 +1,108 @@
+"""Log files: the JSON/NDJSON exports, and bulk imports (CSV, JSON, NDJSON) checked against the log rules."""
+import datetime
+import io
+import json
+from typing import TYPE_CHECKING, Iterable, Iterator, List
+
+from records import MAX_TIMESTAMP, MIN_TIMESTAMP, LogRecord, epoch_seconds
+from team import LOG_STATUSES, LOG_TASK_TYPES, MAX_TIME_SPENT, TASK_TYPE_ALIASES, TEAM_MEMBERS, USERS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def iter_ndjson(logs: Iterable[LogRecord]) -> Iterator[str]:
+    for log in logs:
+        yield json.dumps(log.to_dict(), default=str, ensure_ascii=False) + "\n"
+
+
+# The app's download buttons call these on click, on a thread without the
+# session, so they take the logs to write rather than reading them.
+def ndjson_export(logs: List[LogRecord]) -> str:
+    return "".join(iter_ndjson(logs))
+
+
+def json_export(logs: List[LogRecord]) -> str:
+    return json.dumps([log.to_dict() for log in logs], indent=2, default=str)
+
+
+def read_log_import(file_name: str, data: bytes) -> "pd.DataFrame":
+    """Parse an uploaded CSV, JSON (list of objects) or NDJSON file into a string-typed frame."""
+    import pandas as pd
+    if file_name.lower().endswith(".csv"):
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    elif file_name.lower().endswith((".ndjson", ".jsonl")):
+        df = pd.read_json(io.BytesIO(data), lines=True, dtype=False)
+    else:
+        df = pd.DataFrame(json.loads(data))
+    return df
+
+
+def validate_log_import(df: "pd.DataFrame", task_ids: Iterable[str]):
+    """Validate imported rows column-wise; ``task_ids`` are the ids a row may link to.
+
+    Returns ``(entries, rejected)``: log entry dicts ready for ``add_log_entries``
+    and a frame of the rejected rows with an ``error`` column.
+    """
+    import pandas as pd
+    from dateutil.tz import tzlocal
+    missing = [c for c in ("member", "task", "status", "time_spent") if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+
+    def text(col: str, default: str = "") -> "pd.Series":
+        values = df[col] if col in df.columns else pd.Series(default, index=df.index)
+        return values.fillna(default).astype(str).str.strip()
+
+    member, task, status = text("member"), text("task"), text("status")
+    task_type = text("task_type", "Custom").replace("", "Custom").replace(TASK_TYPE_ALIASES)
+    linked = text("linked_task_id").replace({"None": "", "nan": ""})
+    time_spent = pd.to_numeric(df["time_spent"], errors="coerce")
+    if "timestamp" in df.columns:
+        # Epoch seconds as exported now, or date/time text (older exports, spreadsheets).
+        raw_timestamp = text("timestamp")
+        timestamp = pd.to_numeric(raw_timestamp.where(raw_timestamp.str.fullmatch(r"-?\d+")), errors="coerce")
+        parsed = pd.to_datetime(raw_timestamp.where((raw_timestamp != "") & timestamp.isna()), errors="coerce", format="mixed", utc=True)
+        # Text with an offset is converted to the local clock; naive text keeps its wall-clock time.
+        has_offset = raw_timestamp.str.contains(r"\d:\d\d(?::\d\d(?:\.\d+)?)?\s*(?:Z|[+-]\d\d(?::?\d\d)?)$")
+        parsed = parsed.dt.tz_convert(tzlocal()).dt.tz_localize(None).where(has_offset, parsed.dt.tz_localize(None))
+        timestamp = timestamp.fillna((parsed - pd.Timestamp(0).as_unit("s")) // pd.Timedelta(seconds=1))
+        timestamp = timestamp.where(timestamp.between(MIN_TIMESTAMP, MAX_TIMESTAMP))
+        bad_timestamp = (raw_timestamp != "") & timestamp.isna()
+    else:
+        timestamp = pd.Series(float("nan"), index=df.index)
+        bad_timestamp = pd.Series(False, index=df.index)
+
+    errors = pd.Series("", index=df.index)
+    checks = [
+        (~member.isin(list(USERS)), "unknown member"),
+        (task == "", "empty task"),
+        (~status.isin(LOG_STATUSES), "invalid status"),
+        (~task_type.isin(LOG_TASK_TYPES), "invalid task_type"),
+        (time_spent.isna() | (time_spent < 0) | (time_spent % 1 != 0), "time_spent must be a whole number of minutes >= 0"),
+        (time_spent > MAX_TIME_SPENT, f"time_spent must be at most {MAX_TIME_SPENT} minutes"),
+        ((linked != "") & ~linked.isin(list(task_ids)), "unknown linked_task_id"),
+        (bad_timestamp, "unparseable timestamp"),
+    ]
+    for mask, message in checks:
+        errors = errors.mask(mask & (errors == ""), message)
+    ok = errors == ""
+
+    now = epoch_seconds(datetime.datetime.now())
+    valid = pd.DataFrame({
+        'timestamp': timestamp.fillna(now).astype("int64"),
+        'member': member,
+        'role': member.map(TEAM_MEMBERS),
+        'task': task,
+        'task_type': task_type,
+        'status': status,
+        # Rejected rows are zeroed first: huge values would wrap around when cast.
+        'time_spent': time_spent.where(ok, 0).astype(int),
+        'notes': text("notes"),
+        'linked_task_id': linked,
+    })[ok].astype(object)
+    valid['linked_task_id'] = valid['linked_task_id'].where(valid['linked_task_id'] != "", None)
+    rejected = df[~ok].assign(error=errors[~ok])
+    return valid.to_dict("records"), rejected
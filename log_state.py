@@ -0,0 +1,96 @@
+import threading
+from typing import Dict, List
+
+from archive import LogArchive
+from records import LogRecord
+from rollups import LogRollups, add_member_stats, merge_member_stats
+from search import SearchIndex
+from storage import ARCHIVED_THROUGH, LogStore
+from team import TASK_TYPE_ALIASES
+
+LOG_INDEX_FIELDS = ("member", "status", "task_type")
+
+
+class LogState:
+    """The decoded log history and its indexes, for every session of the app.
+
+    One instance is shared process-wide, so a new session starts from the logs
+    already decoded and only pulls what was written after ``cursor``.
+
+    It only grows, and only inside ``sync()``, under ``lock``: logs are
+    appended, then folded into the indexes, so any position an index hands
+    out is already in ``logs``. Readers don't take the lock; code iterating
+    one of the dicts here snapshots it first (``list(d.items())``), since a
+    sync in another session's thread may add keys meanwhile.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cursor = 0  # the last seq folded in
+        self.logs: List[LogRecord] = []
+        # member -> running totals / that member's logs
+        self.member_stats: Dict[str, Dict] = {}
+        self.logs_by_member: Dict[str, List[LogRecord]] = {}
+        # Per-day / per-hour totals by member and status, for the dashboard
+        self.rollups = LogRollups()
+        # field -> value -> ascending positions in logs
+        self.postings: Dict[str, Dict[str, List[int]]] = {f: {} for f in LOG_INDEX_FIELDS}
+        # False once a backfilled log arrives with an older timestamp than its predecessor
+        self.time_ordered = True
+        self.search_index = SearchIndex()
+        # Logs up to this seq were taken from archive summaries only: counted in
+        # the stats and rollups above, but not held in logs.
+        self.summarized_through = 0
+        self.summarized_count = 0
+
+    def sync(self, store: LogStore, archive: LogArchive) -> int:
+        """Pull the logs written since ``cursor`` (by any session or process); returns how many."""
+        with self.lock:
+            archived_through = int(store.get_meta(ARCHIVED_THROUGH, "0"))
+            if self.cursor < archived_through:
+                self._load_archive(archive, archived_through)
+            new_logs = store.logs_since(self.cursor)
+            if new_logs:
+                for seq, entry in new_logs:
+                    entry["seq"] = seq
+                self._ingest([entry for _, entry in new_logs])
+                self.cursor = new_logs[-1][0]
+            return len(new_logs)
+
+    def _ingest(self, entries: List[Dict]) -> None:
+        logs, postings, search_index = self.logs, self.postings, self.search_index
+        time_ordered = self.time_ordered
+        for entry in entries:
+            if entry.get('task_type') in TASK_TYPE_ALIASES:
+                entry = dict(entry, task_type=TASK_TYPE_ALIASES[entry['task_type']])
+            record = LogRecord(entry)
+            position = len(logs)
+            if position and record.timestamp < logs[-1].timestamp:
+                time_ordered = False
+            logs.append(record)
+            for field in LOG_INDEX_FIELDS:
+                value = entry.get(field) or ('Custom' if field == 'task_type' else None)
+                postings[field].setdefault(value, []).append(position)
+            search_index.add(position, entry['task'], entry.get('notes') or "")
+            self.logs_by_member.setdefault(record.member, []).append(record)
+            self.rollups.add(record)
+            add_member_stats(self.member_stats, record)
+        self.time_ordered = time_ordered
+
+    def _load_archive(self, archive: LogArchive, archived_through: int) -> None:
+        """Catch up on logs sealed into segments since ``cursor``.
+
+        Whole segments contribute only their summaries; a segment that had
+        already been partly synced is read for the entries it is missing.
+        """
+        for segment in archive.segments(archived_through):
+            if segment.last_seq <= self.cursor:
+                continue
+            if segment.first_seq > self.cursor:
+                merge_member_stats(self.member_stats, segment.summary["member_stats"])
+                self.rollups.merge(segment.rollups())
+                self.summarized_through = segment.last_seq
+                self.summarized_count += segment.summary["count"]
+            else:
+                self._ingest([log for log in segment.reader() if log.seq > self.cursor])
+        self.cursor = archived_through
@@ -0,0 +1,64 @@
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+_NULL_SPAN = contextlib.nullcontext()
+_SINK_LOCK = threading.Lock()
+
+
+class RerunProfiler:
+    """Timed spans and counters for one Streamlit rerun at a time.
+
+    When disabled, ``span()`` hands back a shared no-op context manager and
+    ``count()`` returns immediately, so instrumented code pays almost nothing.
+    Finished reruns are kept in a bounded history (for the sidebar panel)
+    and/or appended as JSON lines to ``sink_path``.
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 20, keep_history: bool = True,
+                 sink_path: Optional[str] = None):
+        self.enabled = enabled
+        self.keep_history = keep_history
+        self.sink_path = sink_path
+        self.history = deque(maxlen=history)
+        self._current: Optional[Dict] = None
+        self._started = 0.0
+
+    def start_rerun(self, label: str = "") -> None:
+        if not self.enabled:
+            return
+        self._current = {"started": time.time(), "label": label, "spans": {}, "counters": {}}
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _timed(self, spans: Dict[str, float], name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            spans[name] = spans.get(name, 0.0) + time.perf_counter() - start
+
+    def span(self, name: str):
+        if self._current is None:
+            return _NULL_SPAN
+        return self._timed(self._current["spans"], name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self._current is not None:
+            counters = self._current["counters"]
+            counters[name] = counters.get(name, 0) + n
+
+    def end_rerun(self) -> None:
+        record, self._current = self._current, None
+        if record is None:
+            return
+        record["total_s"] = time.perf_counter() - self._started
+        if self.keep_history:
+            self.history.append(record)
+        if self.sink_path:
+            line = json.dumps(record) + "\n"
+            with _SINK_LOCK, open(self.sink_path, "a", encoding="utf-8") as f:
+                f.write(line)
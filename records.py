@@ -0,0 +1,176 @@
+import datetime
+import sys
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime.datetime(1970, 1, 1)
+_SECOND = datetime.timedelta(seconds=1)
+SECONDS_PER_DAY = 86400
+
+
+# Log timestamps are naive local wall-clock times held as int seconds since
+# the epoch; no time zone is applied either way, so they format back to the
+# text that was logged.
+def epoch_seconds(dt: datetime.datetime) -> int:
+    return (dt - _EPOCH) // _SECOND
+
+
+def parse_timestamp(text: str) -> int:
+    dt = datetime.datetime.fromisoformat(text)
+    if dt.tzinfo is not None:
+        # Text with an explicit offset (``Z``, ``+05:30``) is moved onto the local clock.
+        dt = dt.astimezone().replace(tzinfo=None)
+    return epoch_seconds(dt)
+
+
+# The range accepted for timestamps from outside the app (imports, the ingest
+# API). Comfortably inside what the date helpers below can represent, and far
+# below millisecond epochs, which would otherwise pass as seconds.
+MIN_TIMESTAMP = epoch_seconds(datetime.datetime(1900, 1, 1))
+MAX_TIMESTAMP = epoch_seconds(datetime.datetime(9000, 1, 1))
+
+
+def to_epoch(value) -> int:
+    """A log timestamp as int seconds, also accepting the ``YYYY-MM-DD HH:MM:SS``
+    strings that logs and exports carried before timestamps were stored as ints."""
+    return parse_timestamp(value) if isinstance(value, str) else int(value)
+
+
+def day_to_date(day: int) -> datetime.date:
+    """The date of a ``timestamp // SECONDS_PER_DAY`` bucket."""
+    return datetime.date(1970, 1, 1) + datetime.timedelta(days=int(day))
+
+
+def date_to_day(date: datetime.date) -> int:
+    return (date - datetime.date(1970, 1, 1)).days
+
+
+def format_timestamp(ts: int) -> str:
+    # isoformat() is several times faster than strftime() and, for whole seconds, gives the same text.
+    return (_EPOCH + datetime.timedelta(seconds=ts)).isoformat(" ")
+
+
+class CodeTable:
+    """Small-int codes for a mostly closed set of strings (members, statuses, ...).
+
+    Codes are handed out on first sight and never change, so a table can be
+    shared by every session in the process.
+    """
+
+    def __init__(self, values: Iterable[Optional[str]] = ()):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+        self.update(values)
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    self.values.append(sys.intern(value) if value is not None else None)
+                    code = self._codes[value] = len(self.values) - 1
+        return code
+
+    def update(self, values: Iterable[Optional[str]]) -> None:
+        for value in values:
+            self.code(value)
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """The table's shared copy of ``value``."""
+        return self.values[self.code(value)]
+
+
+# Seeded by app.py from USERS and the status lists; anything else (an old
+# role name, an unknown task type) just gets the next code.
+MEMBERS = CodeTable()
+ROLES = CodeTable()
+STATUSES = CodeTable()
+TASK_TYPES = CodeTable()
+
+LOG_FIELDS = ("timestamp", "member", "role", "task", "task_type", "status", "time_spent", "notes",
+              "linked_task_id", "seq")
+
+
+class LogRecord(Mapping):
+    """One log entry in about a quarter of the memory of the equivalent dict.
+
+    Member, role, status and task type are codes into the shared tables
+    above. Reading it as a mapping
+    (``log['member']``, ``log.get('notes')``, ``dict(log)``) gives back the
+    same values as the dict it was built from.
+    """
+
+    __slots__ = ("seq", "timestamp", "member_code", "role_code", "task", "task_type_code", "status_code",
+                 "time_spent", "notes", "linked_task_id")
+
+    def __init__(self, entry: Dict):
+        self.seq = entry.get("seq")
+        self.timestamp = to_epoch(entry["timestamp"])
+        self.member_code = MEMBERS.code(entry["member"])
+        self.role_code = ROLES.code(entry.get("role"))
+        self.task = entry["task"]
+        self.task_type_code = TASK_TYPES.code(entry.get("task_type"))
+        self.status_code = STATUSES.code(entry["status"])
+        self.time_spent = entry["time_spent"]
+        self.notes = entry.get("notes")
+        linked = entry.get("linked_task_id")
+        self.linked_task_id = sys.intern(linked) if linked else linked
+
+    @property
+    def member(self) -> str:
+        return MEMBERS.values[self.member_code]
+
+    @property
+    def role(self) -> Optional[str]:
+        return ROLES.values[self.role_code]
+
+    @property
+    def task_type(self) -> Optional[str]:
+        return TASK_TYPES.values[self.task_type_code]
+
+    @property
+    def status(self) -> str:
+        return STATUSES.values[self.status_code]
+
+    def __getitem__(self, key):
+        if key not in _LOG_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(LOG_FIELDS)
+
+    def __len__(self):
+        return len(LOG_FIELDS)
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in LOG_FIELDS}
+
+    def __repr__(self):
+        return f"LogRecord({self.to_dict()!r})"
+
+
+_LOG_KEYS = frozenset(LOG_FIELDS)
+
+
+def upgrade_log_export(logs: Iterable[Dict]) -> List[Dict]:
+    """Rewrite logs from an older JSON/NDJSON export with int timestamps."""
+    return [dict(log, timestamp=to_epoch(log["timestamp"])) for log in logs]
+
+
+if __name__ == "__main__":
+    # python records.py old_export.json > upgraded.json  (JSON or NDJSON; the format is kept)
+    import json
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        json.dump(upgrade_log_export(json.loads(text)), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        for log in upgrade_log_export(json.loads(line) for line in text.splitlines() if line.strip()):
+            sys.stdout.write(json.dumps(log, ensure_ascii=False) + "\n")
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Tuple
+
+from records import SECONDS_PER_DAY, LogRecord
+
+SECONDS_PER_HOUR = 3600
+
+# (member, status) -> [log count, minutes spent]
+Cells = Dict[Tuple[str, str], List[int]]
+
+MEMBER_STAT_FIELDS = ("total_time", "total_tasks", "completed_tasks", "completed_duties")
+
+
+def add_member_stats(member_stats: Dict[str, Dict], log: LogRecord) -> None:
+    """Fold one log into the running per-member totals."""
+    stats = member_stats.get(log.member)
+    if stats is None:
+        stats = member_stats[log.member] = dict.fromkeys(MEMBER_STAT_FIELDS, 0)
+    stats["total_time"] += log.time_spent
+    stats["total_tasks"] += 1
+    if log.status == "Completed":
+        stats["completed_tasks"] += 1
+        if log.task_type in ("Assigned Duty", "Assigned Task"):
+            stats["completed_duties"] += 1
+
+
+def merge_member_stats(member_stats: Dict[str, Dict], other: Dict[str, Dict]) -> None:
+    for member, stats in other.items():
+        totals = member_stats.setdefault(member, dict.fromkeys(MEMBER_STAT_FIELDS, 0))
+        for field in MEMBER_STAT_FIELDS:
+            totals[field] += stats.get(field, 0)
+
+
+class LogRollups:
+    """Running per-day and per-hour totals of the logs by member and status.
+
+    Buckets are ``timestamp // SECONDS_PER_DAY`` and ``timestamp //
+    SECONDS_PER_HOUR``, so reading a chart or a set of totals costs
+    O(buckets x members x statuses) however many logs there are. Day
+    ranges are inclusive; ``None`` leaves that end open. Reads snapshot the
+    tables, so they are safe while another thread adds logs.
+    """
+
+    def __init__(self):
+        self.daily: Dict[int, Cells] = {}
+        self.hourly: Dict[int, Cells] = {}
+
+    def add(self, log: LogRecord) -> None:
+        key = (log.member, log.status)
+        for table, bucket in ((self.daily, log.timestamp // SECONDS_PER_DAY),
+                              (self.hourly, log.timestamp // SECONDS_PER_HOUR)):
+            cells = table.get(bucket)
+            if cells is None:
+                cells = table[bucket] = {}
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [1, log.time_spent]
+            else:
+                cell[0] += 1
+                cell[1] += log.time_spent
+
+    def merge(self, other: "LogRollups") -> None:
+        for table, other_table in ((self.daily, other.daily), (self.hourly, other.hourly)):
+            for bucket, other_cells in other_table.items():
+                cells = table.setdefault(bucket, {})
+                for key, (count, minutes) in other_cells.items():
+                    cell = cells.get(key)
+                    if cell is None:
+                        cells[key] = [count, minutes]
+                    else:
+                        cell[0] += count
+                        cell[1] += minutes
+
+    def to_json(self) -> Dict[str, List]:
+        return {name: [[bucket, member, status, count, minutes]
+                       for bucket, cells in table.items() for (member, status), (count, minutes) in cells.items()]
+                for name, table in (("daily", self.daily), ("hourly", self.hourly))}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, List]) -> "LogRollups":
+        rollups = cls()
+        for name, table in (("daily", rollups.daily), ("hourly", rollups.hourly)):
+            for bucket, member, status, count, minutes in data.get(name, []):
+                table.setdefault(bucket, {})[(member, status)] = [count, minutes]
+        return rollups
+
+    def days(self) -> List[int]:
+        return sorted(self.daily)
+
+    def _buckets(self, hourly: bool, start_day: Optional[int], end_day: Optional[int]):
+        table, per_day = (self.hourly, SECONDS_PER_DAY // SECONDS_PER_HOUR) if hourly else (self.daily, 1)
+        low = None if start_day is None else start_day * per_day
+        high = None if end_day is None else (end_day + 1) * per_day
+        for bucket, cells in list(table.items()):
+            if (low is None or bucket >= low) and (high is None or bucket < high):
+                yield bucket, cells
+
+    def counts_by_member(self, hourly: bool = False, start_day: Optional[int] = None,
+                         end_day: Optional[int] = None) -> Dict[int, Dict[str, int]]:
+        """bucket -> member -> number of logs."""
+        series = {}
+        for bucket, cells in self._buckets(hourly, start_day, end_day):
+            row = series[bucket] = {}
+            for (member, _), (count, _) in list(cells.items()):
+                row[member] = row.get(member, 0) + count
+        return series
+
+    def totals(self, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Cells:
+        """(member, status) -> [log count, minutes spent] over the day range."""
+        totals: Cells = {}
+        for _, cells in self._buckets(False, start_day, end_day):
+            for key, (count, minutes) in list(cells.items()):
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = [count, minutes]
+                else:
+                    total[0] += count
+                    total[1] += minutes
+        return totals
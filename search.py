@@ -0,0 +1,67 @@
+import bisect
+import re
+import unicodedata
+from typing import Dict, List
+
+# Word characters plus the Devanagari block, so vowel signs and viramas stay
+# inside Hindi words; the danda (।) and double danda (॥) are punctuation.
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(unicodedata.normalize("NFC", text or "").casefold())
+
+
+class SearchIndex:
+    """Incremental inverted index from terms to ascending log positions.
+
+    Query terms of ``MIN_PREFIX`` characters or more are treated as prefixes,
+    and a document must match all terms: ``"judg fetch"`` finds logs
+    mentioning both "judgments" and "fetched".
+    """
+
+    MIN_PREFIX = 2
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._vocab: List[str] = []  # sorted, for prefix range scans
+
+    def add(self, position: int, *texts: str) -> None:
+        for term in set(t for text in texts for t in tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = []
+                bisect.insort(self._vocab, term)
+            postings.append(position)
+
+    def _prefix_matches(self, prefix: str) -> List[int]:
+        if len(prefix) < self.MIN_PREFIX:
+            return self._postings.get(prefix, [])
+        vocab = self._vocab
+        i = bisect.bisect_left(vocab, prefix)
+        terms = []
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            terms.append(vocab[i])
+            i += 1
+        if not terms:
+            return []
+        if len(terms) == 1:
+            return self._postings[terms[0]]
+        matched = set()
+        for term in terms:
+            matched.update(self._postings[term])
+        return sorted(matched)
+
+    def search(self, query: str) -> List[int]:
+        """Ascending positions of the logs matching every term of ``query``."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        results = sorted((self._prefix_matches(t) for t in set(terms)), key=len)
+        positions = results[0]
+        for other in results[1:]:
+            if not positions:
+                break
+            other = set(other)
+            positions = [p for p in positions if p in other]
+        return positions
@@ -0,0 +1,496 @@
+import contextlib
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from records import epoch_seconds
+
+_DATE_FIELDS = ("deadline", "start", "end")
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_record(record: Dict) -> str:
+    return json.dumps(record, default=_json_default, ensure_ascii=False)
+
+
+def decode_record(text: str) -> Dict:
+    return _decode_fields(json.loads(text))
+
+
+def _decode_fields(record: Dict) -> Dict:
+    for field in _DATE_FIELDS:
+        if isinstance(record.get(field), str):
+            record[field] = datetime.date.fromisoformat(record[field])
+    for field in _DATETIME_FIELDS:
+        if isinstance(record.get(field), str):
+            record[field] = datetime.datetime.fromisoformat(record[field])
+    return record
+
+
+class TaskConflict(Exception):
+    """A task write carried a stale ``version``; nothing in the batch was written."""
+
+    def __init__(self, task_ids: List[str]):
+        super().__init__(f"Task(s) changed concurrently: {', '.join(task_ids)}")
+        self.task_ids = task_ids
+
+
+# Meta key: logs with seq <= this have been sealed into archive segments and dropped.
+ARCHIVED_THROUGH = "archived_through"
+
+# (task_id, task or None for a delete, version the writer last saw)
+TaskWrite = Tuple[str, Optional[Dict], int]
+
+# (seq, at, task_id, task after the write or None for a delete); ``at`` is epoch seconds
+TaskEvent = Tuple[int, int, str, Optional[Dict]]
+
+# A snapshot of every live task is stored each time the event stream passes a multiple of this.
+TASK_SNAPSHOT_EVERY = 200
+
+
+def _snapshot_due(first_seq: int, last_seq: int) -> bool:
+    return last_seq // TASK_SNAPSHOT_EVERY > (first_seq - 1) // TASK_SNAPSHOT_EVERY
+
+
+class LogStore:
+    """Storage backend interface.
+
+    Logs and milestones are append-only and numbered by ``seq``; tasks are
+    upserted/deleted by id and stamped with a store-wide ``rev``. The
+    ``*_since`` readers return only rows newer than the caller's cursor.
+
+    Tasks also carry a per-task ``version``. A write must quote the version
+    it was based on (``task["version"]``, 0 for a new task) and is rejected
+    with ``TaskConflict`` if someone else wrote the task in the meantime;
+    stored tasks come back with the incremented version.
+
+    Every task write is also appended to an event stream, in the same
+    transaction, with periodic snapshots of all tasks. ``tasks_at`` rebuilds
+    the task list as of any moment from the nearest snapshot plus at most
+    ``TASK_SNAPSHOT_EVERY`` events.
+    """
+
+    def append_log(self, entry: Dict) -> int:
+        raise NotImplementedError
+
+    def append_logs(self, entries: List[Dict]) -> int:
+        """Append a batch of logs; returns the seq of the last one (0 if empty)."""
+        seq = 0
+        for entry in entries:
+            seq = self.append_log(entry)
+        return seq
+
+    def logs_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        raise NotImplementedError
+
+    def archive_logs_through(self, seq: int) -> None:
+        """Drop logs up to ``seq`` and record it under ``ARCHIVED_THROUGH``, in one step.
+
+        Seqs are never reused, so cursors stay valid.
+        """
+        raise NotImplementedError
+
+    def _write_tasks(self, writes: List[TaskWrite]) -> int:
+        """Apply all writes or none; returns the rev of the last one (0 if empty)."""
+        raise NotImplementedError
+
+    def put_task(self, task: Dict) -> int:
+        return self.put_tasks([task])
+
+    def put_tasks(self, tasks: List[Dict]) -> int:
+        return self._write_tasks([(t["id"], t, t.get("version", 0)) for t in tasks])
+
+    def delete_task(self, task_id: str, version: int) -> int:
+        return self.delete_tasks([(task_id, version)])
+
+    def delete_tasks(self, tasks: List[Tuple[str, int]]) -> int:
+        """Delete ``(task_id, version)`` pairs together, or none of them on a conflict."""
+        return self._write_tasks([(task_id, None, version) for task_id, version in tasks])
+
+    def tasks_since(self, cursor: int) -> List[Tuple[int, str, Optional[Dict]]]:
+        """Return ``(rev, task_id, task)`` rows; ``task`` is None for deletions."""
+        raise NotImplementedError
+
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict]:
+        """id -> current task for the ids that exist (deleted ones are left out)."""
+        raise NotImplementedError
+
+    def task_events_since(self, cursor: int, until: Optional[int] = None) -> List[TaskEvent]:
+        """Events after seq ``cursor``; with ``until``, only up to the first one recorded later than that.
+
+        Events are stamped as they are written, so their times only go up with seq.
+        """
+        raise NotImplementedError
+
+    def task_history(self, task_id: str) -> List[TaskEvent]:
+        """Every recorded write of one task, oldest first."""
+        raise NotImplementedError
+
+    def task_snapshot_at(self, at: int) -> Tuple[int, Dict[str, Dict]]:
+        """The latest snapshot taken at or before ``at``: ``(event seq, id -> task)``; ``(0, {})`` if none."""
+        raise NotImplementedError
+
+    def tasks_at(self, at: int) -> Dict[str, Dict]:
+        """id -> task as it stood at time ``at`` (epoch seconds)."""
+        seq, tasks = self.task_snapshot_at(at)
+        for _, _, task_id, task in self.task_events_since(seq, until=at):
+            if task is None:
+                tasks.pop(task_id, None)
+            else:
+                tasks[task_id] = task
+        return tasks
+
+    def append_milestone(self, milestone: Dict) -> int:
+        raise NotImplementedError
+
+    def timeline_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        raise NotImplementedError
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        raise NotImplementedError
+
+    def set_meta(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def allocate_ids(self, name: str, count: int = 1) -> range:
+        """Reserve ``count`` consecutive numbers from the named counter, unique across sessions."""
+        raise NotImplementedError
+
+
+class MemoryLogStore(LogStore):
+    """Process-local, non-durable store (benchmarks and throwaway demos)."""
+
+    def __init__(self, location: str = ""):
+        self._lock = threading.Lock()
+        self._logs: List[Optional[str]] = []  # None once archived
+        self._timeline: List[str] = []
+        self._tasks: Dict[str, Tuple[int, int, Optional[str]]] = {}  # id -> (rev, version, data)
+        self._task_rev = 0
+        self._task_events: List[Tuple[int, str, Optional[str]]] = []  # (at, id, data)
+        self._task_snapshots: List[Tuple[int, int, Dict[str, str]]] = []  # (seq, at, id -> data)
+        self._meta: Dict[str, str] = {}
+
+    def append_log(self, entry: Dict) -> int:
+        return self.append_logs([entry])
+
+    def append_logs(self, entries: List[Dict]) -> int:
+        encoded = [encode_record(e) for e in entries]
+        with self._lock:
+            self._logs.extend(encoded)
+            return len(self._logs) if encoded else 0
+
+    def logs_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        with self._lock:
+            rows = self._logs[cursor:]
+        return [(cursor + i + 1, decode_record(r)) for i, r in enumerate(rows) if r is not None]
+
+    def archive_logs_through(self, seq: int) -> None:
+        with self._lock:
+            start = int(self._meta.get(ARCHIVED_THROUGH, "0"))
+            for i in range(start, seq):
+                self._logs[i] = None  # keeps list positions == seq - 1
+            self._meta[ARCHIVED_THROUGH] = str(max(start, seq))
+
+    def _write_tasks(self, writes: List[TaskWrite]) -> int:
+        encoded = [(tid, encode_record(dict(task, version=seen + 1)) if task else None, seen)
+                   for tid, task, seen in writes]
+        with self._lock:
+            stale = [tid for tid, _, seen in encoded if self._tasks.get(tid, (0, 0, None))[1] != seen]
+            if stale:
+                raise TaskConflict(stale)
+            at = epoch_seconds(datetime.datetime.now())
+            for tid, data, seen in encoded:
+                self._task_rev += 1
+                self._tasks[tid] = (self._task_rev, seen + 1, data)
+                self._task_events.append((at, tid, data))
+            seq = len(self._task_events)
+            if encoded and _snapshot_due(seq - len(encoded) + 1, seq):
+                self._task_snapshots.append(
+                    (seq, at, {tid: data for tid, (_, _, data) in self._tasks.items() if data is not None}))
+            return self._task_rev if encoded else 0
+
+    def tasks_since(self, cursor: int) -> List[Tuple[int, str, Optional[Dict]]]:
+        with self._lock:
+            rows = [(rev, tid, data) for tid, (rev, _, data) in self._tasks.items() if rev > cursor]
+        rows.sort()
+        return [(rev, tid, decode_record(data) if data else None) for rev, tid, data in rows]
+
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict]:
+        with self._lock:
+            rows = [(tid, self._tasks[tid][2]) for tid in set(task_ids) if tid in self._tasks]
+        return {tid: decode_record(data) for tid, data in rows if data is not None}
+
+    def task_events_since(self, cursor: int, until: Optional[int] = None) -> List[TaskEvent]:
+        with self._lock:
+            rows = self._task_events[cursor:]
+        events = []
+        for i, (at, tid, data) in enumerate(rows):
+            if until is not None and at > until:
+                break
+            events.append((cursor + i + 1, at, tid, decode_record(data) if data else None))
+        return events
+
+    def task_history(self, task_id: str) -> List[TaskEvent]:
+        with self._lock:
+            rows = list(self._task_events)
+        return [(i + 1, at, tid, decode_record(data) if data else None)
+                for i, (at, tid, data) in enumerate(rows) if tid == task_id]
+
+    def task_snapshot_at(self, at: int) -> Tuple[int, Dict[str, Dict]]:
+        with self._lock:
+            taken = [snapshot for snapshot in self._task_snapshots if snapshot[1] <= at]
+        if not taken:
+            return 0, {}
+        seq, _, tasks = taken[-1]
+        return seq, {tid: decode_record(data) for tid, data in tasks.items()}
+
+    def append_milestone(self, milestone: Dict) -> int:
+        with self._lock:
+            self._timeline.append(encode_record(milestone))
+            return len(self._timeline)
+
+    def timeline_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        with self._lock:
+            rows = self._timeline[cursor:]
+        return [(cursor + i + 1, decode_record(r)) for i, r in enumerate(rows)]
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self._meta.get(key, default)
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._meta[key] = value
+
+    def allocate_ids(self, name: str, count: int = 1) -> range:
+        with self._lock:
+            start = int(self._meta.get(f"counter:{name}", "0"))
+            self._meta[f"counter:{name}"] = str(start + count)
+        return range(start + 1, start + count + 1)
+
+
+class SQLiteLogStore(LogStore):
+    """Embedded SQLite store running in WAL (write-ahead log) mode.
+
+    A single connection is shared by all Streamlit sessions in the process
+    and guarded by a lock; other processes pointed at the same file see the
+    writes through their own cursors. Writes run in ``BEGIN IMMEDIATE``
+    transactions, so version checks and seq/rev/id allocation hold across
+    processes too. The lock covers only the store call, never a render.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS logs (seq INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS timeline (seq INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS tasks (id TEXT PRIMARY KEY, rev INTEGER NOT NULL, data TEXT,
+                                      version INTEGER NOT NULL DEFAULT 0);
+    CREATE INDEX IF NOT EXISTS tasks_by_rev ON tasks (rev);
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS task_events (seq INTEGER PRIMARY KEY AUTOINCREMENT, at INTEGER NOT NULL,
+                                            task_id TEXT NOT NULL, data TEXT);
+    CREATE INDEX IF NOT EXISTS task_events_by_task ON task_events (task_id, seq);
+    CREATE TABLE IF NOT EXISTS task_snapshots (seq INTEGER PRIMARY KEY, at INTEGER NOT NULL, data TEXT NOT NULL);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Autocommit mode; _write() opens the transactions explicitly.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        # Task databases created before per-task versions existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._seed_task_events()
+
+    def _seed_task_events(self):
+        # Databases from before the event stream: each existing task's history
+        # starts with one event for its current state, at its last update.
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM task_events LIMIT 1").fetchone():
+                return
+            tasks = [(tid, data, decode_record(data))
+                     for tid, data in conn.execute("SELECT id, data FROM tasks WHERE data IS NOT NULL")]
+            if not tasks:
+                return
+            events = sorted((epoch_seconds(task.get("updated_at") or task.get("created_at") or datetime.datetime.now()),
+                             tid, data) for tid, data, task in tasks)
+            conn.executemany("INSERT INTO task_events (at, task_id, data) VALUES (?, ?, ?)", events)
+            self._snapshot(conn, conn.execute("SELECT MAX(seq) FROM task_events").fetchone()[0], events[-1][0])
+
+    @staticmethod
+    def _snapshot(conn, seq: int, at: int) -> None:
+        conn.execute(
+            "INSERT INTO task_snapshots (seq, at, data) "
+            "SELECT ?, ?, COALESCE(json_group_object(id, json(data)), '{}') FROM tasks WHERE data IS NOT NULL",
+            (seq, at),
+        )
+
+    @contextlib.contextmanager
+    def _write(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _insert(self, table: str, records: List[Dict]) -> int:
+        # One transaction per batch; seqs are contiguous because writers are serialised.
+        encoded = [(encode_record(r),) for r in records]
+        if not encoded:
+            return 0
+        with self._write() as conn:
+            conn.executemany(f"INSERT INTO {table} (data) VALUES (?)", encoded)
+            return conn.execute(f"SELECT MAX(seq) FROM {table}").fetchone()[0]
+
+    def _select_since(self, table: str, cursor: int) -> List[Tuple[int, Dict]]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT seq, data FROM {table} WHERE seq > ? ORDER BY seq", (cursor,)).fetchall()
+        return [(seq, decode_record(data)) for seq, data in rows]
+
+    def append_log(self, entry: Dict) -> int:
+        return self._insert("logs", [entry])
+
+    def append_logs(self, entries: List[Dict]) -> int:
+        return self._insert("logs", entries)
+
+    def logs_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        return self._select_since("logs", cursor)
+
+    def archive_logs_through(self, seq: int) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM logs WHERE seq <= ?", (seq,))
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                (ARCHIVED_THROUGH, seq),
+            )
+
+    def _write_tasks(self, writes: List[TaskWrite]) -> int:
+        if not writes:
+            return 0
+        # Deletions are kept as tombstones (data NULL) so other sessions' cursors see them.
+        encoded = [(tid, encode_record(dict(task, version=seen + 1)) if task else None, seen)
+                   for tid, task, seen in writes]
+        with self._write() as conn:
+            stale = []
+            for tid, _, seen in encoded:
+                row = conn.execute("SELECT version FROM tasks WHERE id = ?", (tid,)).fetchone()
+                if (row[0] if row else 0) != seen:
+                    stale.append(tid)
+            if stale:
+                raise TaskConflict(stale)
+            rev = conn.execute("SELECT COALESCE(MAX(rev), 0) FROM tasks").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO tasks (id, rev, data, version) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET rev = excluded.rev, data = excluded.data, version = excluded.version",
+                [(tid, rev + i, data, seen + 1) for i, (tid, data, seen) in enumerate(encoded, 1)],
+            )
+            at = epoch_seconds(datetime.datetime.now())
+            conn.executemany("INSERT INTO task_events (at, task_id, data) VALUES (?, ?, ?)",
+                             [(at, tid, data) for tid, data, _ in encoded])
+            seq = conn.execute("SELECT MAX(seq) FROM task_events").fetchone()[0]
+            if _snapshot_due(seq - len(encoded) + 1, seq):
+                self._snapshot(conn, seq, at)
+            return rev + len(encoded)
+
+    def tasks_since(self, cursor: int) -> List[Tuple[int, str, Optional[Dict]]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT rev, id, data FROM tasks WHERE rev > ? ORDER BY rev", (cursor,)).fetchall()
+        return [(rev, tid, decode_record(data) if data else None) for rev, tid, data in rows]
+
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict]:
+        task_ids = list(set(task_ids))
+        if not task_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM tasks WHERE data IS NOT NULL AND id IN ({', '.join('?' * len(task_ids))})",
+                task_ids).fetchall()
+        return {tid: decode_record(data) for tid, data in rows}
+
+    def _select_events(self, where: str, params: Tuple) -> List[TaskEvent]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT seq, at, task_id, data FROM task_events WHERE {where} ORDER BY seq",
+                                      params).fetchall()
+        return [(seq, at, tid, decode_record(data) if data else None) for seq, at, tid, data in rows]
+
+    def task_events_since(self, cursor: int, until: Optional[int] = None) -> List[TaskEvent]:
+        if until is None:
+            return self._select_events("seq > ?", (cursor,))
+        events = []
+        with self._lock:
+            for seq, at, tid, data in self._conn.execute(
+                    "SELECT seq, at, task_id, data FROM task_events WHERE seq > ? ORDER BY seq", (cursor,)):
+                if at > until:
+                    break
+                events.append((seq, at, tid, data))
+        return [(seq, at, tid, decode_record(data) if data else None) for seq, at, tid, data in events]
+
+    def task_history(self, task_id: str) -> List[TaskEvent]:
+        return self._select_events("task_id = ?", (task_id,))
+
+    def task_snapshot_at(self, at: int) -> Tuple[int, Dict[str, Dict]]:
+        with self._lock:
+            row = self._conn.execute("SELECT seq, data FROM task_snapshots WHERE at <= ? ORDER BY seq DESC LIMIT 1",
+                                     (at,)).fetchone()
+        if row is None:
+            return 0, {}
+        return row[0], {tid: _decode_fields(task) for tid, task in json.loads(row[1]).items()}
+
+    def append_milestone(self, milestone: Dict) -> int:
+        return self._insert("timeline", [milestone])
+
+    def timeline_since(self, cursor: int) -> List[Tuple[int, Dict]]:
+        return self._select_since("timeline", cursor)
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def allocate_ids(self, name: str, count: int = 1) -> range:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + ?",
+                (f"counter:{name}", str(count), count),
+            )
+            end = int(conn.execute("SELECT value FROM meta WHERE key = ?", (f"counter:{name}",)).fetchone()[0])
+        return range(end - count + 1, end + 1)
+
+
+STORE_BACKENDS = {
+    "sqlite": SQLiteLogStore,
+    "memory": MemoryLogStore,
+}
+
+
+def open_store(url: str) -> LogStore:
+    """Open a backend from a URL such as ``sqlite:///hackathon_log.db`` or ``memory://``."""
+    scheme, _, location = url.partition("://")
+    if scheme not in STORE_BACKENDS:
+        raise ValueError(f"Unknown log store backend: {scheme!r}")
+    # sqlite:///relative.db -> "relative.db", sqlite:////abs/path.db -> "/abs/path.db"
+    path = location[1:] if location.startswith("/") else location
+    return STORE_BACKENDS[scheme](path)
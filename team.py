@@ -0,0 +1,37 @@
+from typing import Dict
+
+# Shared by the Streamlit app and the ingestion API (ingest_api.py).
+USERS = {
+    "Arryan":   {"password": "123",     "role": "API/Data Fetch", "is_leader": False},
+    "Arth":     {"password": "123",     "role": "Backend 1",      "is_leader": False},
+    "Shashwat": {"password": "123",     "role": "Backend 2",      "is_leader": False},
+    "Member 4": {"password": "leader",  "role": "Team Leader",    "is_leader": True},
+}
+
+TEAM_MEMBERS: Dict[str, str] = {u: USERS[u]["role"] for u in USERS}
+
+LOG_STATUSES = ["Not Started", "In Progress", "Completed", "Blocked"]
+LOG_TASK_TYPES = ["Assigned Duty", "Assigned Task", "Custom"]
+# Older spellings, mapped to LOG_TASK_TYPES wherever logs come in: the Add Log
+# form used to store its custom logs as "Custom Task".
+TASK_TYPE_ALIASES = {"Custom Task": "Custom"}
+TASK_STATUSES = ["Assigned", "In Progress", "Completed", "Approved"]
+OPEN_TASK_STATUSES = ["Assigned", "In Progress"]
+# Upper bound on a log's time_spent, in minutes: a week.
+MAX_TIME_SPENT = 7 * 24 * 60
+
+
+def canonical_task_type(task_type) -> str:
+    """``task_type`` under its current name; empty means ``"Custom"``."""
+    if not task_type:
+        return "Custom"
+    return TASK_TYPE_ALIASES.get(task_type, task_type) if isinstance(task_type, str) else task_type
+
+
+def linked_task_status(task_status: str, log_status: str) -> str:
+    """The status a task moves to when a log linked to it is written."""
+    if log_status == "In Progress" and task_status == "Assigned":
+        return "In Progress"
+    if log_status == "Completed":
+        return "Completed"
+    return task_status
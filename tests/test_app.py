@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from storage import TaskConflict  # noqa: E402
+
+
+def _dashboard():
+    import app
+    app._init_state()  # the module is imported once per process, not once per session
+    app._sync_state()
+    app.dashboard_tab()
+
+
+def _log(day):
+    return {"timestamp": datetime.datetime(2026, 1, day, 12), "member": "Arth", "role": "Backend 1",
+            "task": f"task {day}", "task_type": "Custom", "status": "Completed", "time_spent": 30,
+            "notes": "", "linked_task_id": None}
+
+
+@pytest.fixture
+def app_store(monkeypatch, tmp_path):
+    monkeypatch.setenv("HACKATHON_LOG_STORE", "memory://")
+    monkeypatch.setenv("HACKATHON_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_function(_dashboard, default_timeout=60)
+    at.run()
+    import app
+    store = app.get_store()
+    yield at, store
+    app.get_store.clear()
+    app.get_log_state.clear()
+
+
+def _total_tasks(at):
+    return next(m.value for m in at.markdown if "Total Tasks" in m.value)
+
+
+def test_dashboard_range_follows_new_days(app_store):
+    at, store = app_store
+    store.append_logs([_log(5), _log(6)])
+    at.run()
+    assert at.date_input[0].value == (datetime.date(2026, 1, 5), datetime.date(2026, 1, 6))
+    assert "📋 2<" in _total_tasks(at)
+
+    store.append_logs([_log(7)])
+    at.run()
+    assert not at.exception
+    assert at.date_input[0].value == (datetime.date(2026, 1, 5), datetime.date(2026, 1, 7))
+    assert "📋 3<" in _total_tasks(at)
+
+
+def test_new_sessions_start_from_the_shared_log_state(app_store, monkeypatch):
+    at, store = app_store
+    store.append_logs([_log(5), _log(6)])
+    at.run()
+    reads = []
+    logs_since = store.logs_since
+    monkeypatch.setattr(store, "logs_since", lambda cursor: reads.append(cursor) or logs_since(cursor))
+    second = AppTest.from_function(_dashboard, default_timeout=60)
+    second.run()
+    assert reads and set(reads) == {2}  # never re-read from the start of the history
+    assert second.session_state.log_cursor == 2
+    assert "📋 2<" in _total_tasks(second)
+
+
+def _log_linked(entry):
+    import app
+    import streamlit as st
+    app._init_state()
+    app._sync_state()
+    if st.button("log"):
+        st.session_state.linked_saved = app.add_log_entries([entry])
+
+
+def test_add_log_entries_reports_a_linked_task_left_behind(app_store, monkeypatch):
+    _, store = app_store
+    store.put_tasks([{"id": "TASK-1", "member": "Arth", "task": "t", "deadline": None, "status": "Assigned",
+                      "approved": False}])
+
+    def conflict(task_list):
+        raise TaskConflict([t["id"] for t in task_list])
+    monkeypatch.setattr(store, "put_tasks", conflict)
+    entry = dict(_log(8), status="In Progress", task_type="Assigned Task", linked_task_id="TASK-1")
+    at = AppTest.from_function(_log_linked, args=(entry,), default_timeout=60)
+    at.run()
+    at.button[0].click().run()
+    assert not at.exception
+    assert at.session_state.linked_saved is False
+    assert [entry["task"] for _, entry in store.logs_since(0)] == ["task 8"]
+    assert store.get_tasks(["TASK-1"])["TASK-1"]["status"] == "Assigned"
@@ -0,0 +1,93 @@
+import pytest
+
+from archive import LogArchive, SegmentReader
+from storage import ARCHIVED_THROUGH
+
+
+def _log(i, member="Arth"):
+    return {"timestamp": 1000 + i, "member": member, "role": "Backend 1", "task": f"task {i}",
+            "task_type": "Custom", "status": "Completed", "time_spent": i, "notes": "", "linked_task_id": None}
+
+
+@pytest.fixture
+def filled(store):
+    store.append_logs([_log(i, "Arth" if i % 3 else "Arryan") for i in range(10)])
+    return store
+
+
+def _ranges(segments):
+    return [(s.first_seq, s.last_seq) for s in segments]
+
+
+def test_seal_moves_a_seq_prefix_into_a_segment(filled, tmp_path):
+    archive = LogArchive(str(tmp_path))
+    segment = archive.seal(filled, 1004)
+    assert (segment.first_seq, segment.last_seq) == (1, 4)
+    assert filled.get_meta(ARCHIVED_THROUGH) == "4"
+    assert [seq for seq, _ in filled.logs_since(0)] == list(range(5, 11))
+    assert segment.summary["count"] == 4
+    assert segment.summary["member_stats"]["Arth"]["total_time"] == 1 + 2
+    assert segment.summary["member_stats"]["Arryan"]["total_time"] == 0 + 3
+    assert archive.seal(filled, 1004) is None
+
+
+def test_sealing_stops_at_the_first_newer_log(store, tmp_path):
+    store.append_logs([_log(0), _log(9), _log(1)])  # a backfilled entry after a newer one
+    segment = LogArchive(str(tmp_path)).seal(store, 1005)
+    assert (segment.first_seq, segment.last_seq) == (1, 1)
+
+
+def test_segments_are_ordered_and_filtered_by_the_archived_cursor(filled, tmp_path):
+    archive = LogArchive(str(tmp_path))
+    archive.seal(filled, 1003)
+    archive.seal(filled, 1007)
+    other = LogArchive(str(tmp_path))  # another process, scanning the directory
+    assert _ranges(other.segments()) == [(1, 3), (4, 7)]
+    assert _ranges(other.segments(archived_through=5)) == [(1, 3)]
+
+
+def test_reseal_after_an_interrupted_seal_does_not_double_count(filled, tmp_path, monkeypatch):
+    archive, other = LogArchive(str(tmp_path)), LogArchive(str(tmp_path))
+
+    def crash(seq):
+        raise OSError("crashed before the store was updated")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(filled, "archive_logs_through", crash)
+        with pytest.raises(OSError):
+            archive.seal(filled, 1005)
+    assert filled.get_meta(ARCHIVED_THROUGH, "0") == "0"
+    assert _ranges(other.segments()) == [(1, 5)]
+    assert other.segments(archived_through=0) == []
+
+    LogArchive(str(tmp_path)).seal(filled, 1008)
+    archived = int(filled.get_meta(ARCHIVED_THROUGH))
+    for view in (archive, other, LogArchive(str(tmp_path))):
+        segments = view.segments(archived_through=archived)
+        assert _ranges(segments) == [(1, 8)]
+        assert sum(s.summary["count"] for s in segments) == 8
+
+
+def test_segment_reader_pages_like_a_list(filled, tmp_path):
+    segment = LogArchive(str(tmp_path)).seal(filled, 1010)
+    reader = SegmentReader(segment.path)
+    try:
+        assert len(reader) == 10
+        assert reader[0].seq == 1 and reader[0].task == "task 0"
+        assert reader[-1].seq == 10
+        assert [log.seq for log in reader[2:5]] == [3, 4, 5]
+        assert [log.seq for log in reader[::-4]] == [10, 6, 2]
+        assert reader[20:] == []
+        assert [log.time_spent for log in reader] == list(range(10))
+        with pytest.raises(IndexError):
+            reader[10]
+        with pytest.raises(IndexError):
+            reader[-11]
+    finally:
+        reader.close()
+
+
+def test_segment_reader_handles_text_outside_ascii(store, tmp_path):
+    store.append_logs([dict(_log(0), notes="अनुबंध की समीक्षा\nline two"), _log(1)])
+    segment = LogArchive(str(tmp_path)).seal(store, 1002)
+    assert [log.notes for log in segment.reader()] == ["अनुबंध की समीक्षा\nline two", ""]
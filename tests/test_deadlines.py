@@ -0,0 +1,93 @@
+import datetime
+import random
+
+from deadlines import DeadlineIndex, MilestoneIndex, creation_order, due_at
+from records import SECONDS_PER_DAY, epoch_seconds
+
+
+def test_due_at_is_the_end_of_the_deadline_day():
+    day = datetime.date(2026, 1, 5)
+    assert due_at(day) == epoch_seconds(datetime.datetime(2026, 1, 6))
+    assert due_at(None) is None
+
+
+def test_creation_order_compares_id_numbers():
+    assert sorted(["TASK-10", "TASK-2", "TASK-1", "legacy"], key=creation_order) == ["legacy", "TASK-1", "TASK-2", "TASK-10"]
+
+
+def test_ties_come_out_in_creation_order():
+    index = DeadlineIndex()
+    for task_id in ["TASK-11", "TASK-2", "TASK-10", "TASK-1"]:
+        index.set(task_id, 100)
+    index.set("TASK-3", 50)
+    assert list(index) == ["TASK-3", "TASK-1", "TASK-2", "TASK-10", "TASK-11"]
+
+
+def test_set_moves_and_drops_tasks():
+    index = DeadlineIndex()
+    index.set("TASK-1", 100)
+    index.set("TASK-2", 200)
+    index.set("TASK-1", 300)
+    assert list(index) == ["TASK-2", "TASK-1"]
+    index.set("TASK-2", None)
+    index.set("TASK-9", None)
+    assert list(index) == ["TASK-1"] and len(index) == 1
+
+
+def test_between_matches_a_scan():
+    rng = random.Random(7)
+    index, due = DeadlineIndex(), {}
+    for _ in range(500):
+        task_id = f"TASK-{rng.randrange(200)}"
+        due[task_id] = rng.choice([None, rng.randrange(0, 50) * SECONDS_PER_DAY])
+        index.set(task_id, due[task_id])
+    live = {task_id: at for task_id, at in due.items() if at is not None}
+    for start, end in [(None, None), (None, 10 * SECONDS_PER_DAY), (20 * SECONDS_PER_DAY, None),
+                       (5 * SECONDS_PER_DAY, 6 * SECONDS_PER_DAY), (7 * SECONDS_PER_DAY, 7 * SECONDS_PER_DAY)]:
+        expected = sorted((t for t, at in live.items() if (start is None or at >= start) and (end is None or at < end)),
+                          key=lambda t: (live[t], creation_order(t)))
+        assert index.between(start, end) == expected
+
+
+def _milestone(title, start, end):
+    return {"title": title, "start": datetime.date(2026, 1, start), "end": datetime.date(2026, 1, end)}
+
+
+def test_overlapping_matches_a_scan():
+    rng = random.Random(3)
+    index, milestones = MilestoneIndex(), []
+    for n in range(60):
+        start = rng.randrange(1, 28)
+        milestone = _milestone(f"m{n}", start, min(31, start + rng.randrange(0, 10)))
+        milestones.append(milestone)
+        index.add(milestone)
+    assert len(index) == 60
+    for start in range(1, 32):
+        for end in range(start, 32, 3):
+            query = (datetime.date(2026, 1, start), datetime.date(2026, 1, end))
+            found = index.overlapping(*query)
+            assert sorted(m["title"] for m in found) == sorted(
+                m["title"] for m in milestones if m["start"] <= query[1] and m["end"] >= query[0])
+            assert [m["start"] for m in found] == sorted(m["start"] for m in found)
+
+
+def test_a_long_early_milestone_is_found_past_shorter_ones():
+    index = MilestoneIndex()
+    index.add(_milestone("Build", 1, 20))
+    for day in range(2, 10):
+        index.add(_milestone(f"sprint {day}", day, day))
+    assert [m["title"] for m in index.on(datetime.date(2026, 1, 15))] == ["Build"]
+    assert [m["title"] for m in index.on(datetime.date(2026, 1, 25))] == []
+
+
+def test_long_early_milestone_does_not_hide_later_ones(monkeypatch):
+    monkeypatch.setattr(MilestoneIndex, "BUCKET", 4)
+    index = MilestoneIndex()
+    index.add(_milestone("Build", 1, 31))
+    for day in range(2, 30):
+        index.add(_milestone(f"sprint {day}", day, day))
+    index.add(_milestone("Kickoff", 1, 1))  # out of order: rebuilds the buckets after it
+    assert [m["title"] for m in index.on(datetime.date(2026, 1, 17))] == ["Build", "sprint 17"]
+    assert [m["title"] for m in index.overlapping(datetime.date(2026, 1, 1), datetime.date(2026, 1, 3))] == \
+        ["Build", "Kickoff", "sprint 2", "sprint 3"]
+    assert [m["title"] for m in index.on(datetime.date(2026, 1, 31))] == ["Build"]
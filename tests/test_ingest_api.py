@@ -0,0 +1,187 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from ingest_api import LINKED_TASK_NOT_UPDATED, IngestServer, RequestError, authenticate, validate_log_entry
+from records import parse_timestamp
+from storage import TaskConflict
+
+NOW = parse_timestamp("2026-01-05 12:00:00")
+
+
+def _entry(**fields):
+    return dict({"task": "fetch judgments", "status": "Completed", "time_spent": 30}, **fields)
+
+
+def _error(item, user="Arth"):
+    return validate_log_entry(item, user, NOW)[1]
+
+
+def test_valid_entry_is_filled_in_for_the_store():
+    entry, error = validate_log_entry(_entry(notes="ok"), "Arth", NOW)
+    assert error is None
+    assert entry == {"timestamp": NOW, "member": "Arth", "role": "Backend 1", "task": "fetch judgments",
+                     "task_type": "Custom", "status": "Completed", "time_spent": 30, "notes": "ok",
+                     "linked_task_id": None}
+
+
+@pytest.mark.parametrize("item, error", [
+    ("not an object", "expected an object"),
+    (_entry(member="Nobody"), "unknown member"),
+    (_entry(member="Arryan"), "members may only log for themselves"),
+    (_entry(task="   "), "empty task"),
+    (_entry(status="Done"), "invalid status"),
+    (_entry(task_type="Weird"), "invalid task_type"),
+    (_entry(time_spent=-1), "time_spent must be a whole number of minutes >= 0"),
+    (_entry(time_spent=2.5), "time_spent must be a whole number of minutes >= 0"),
+    (_entry(time_spent=True), "time_spent must be a whole number of minutes >= 0"),
+    (_entry(time_spent=10**23), "time_spent must be at most 10080 minutes"),
+    (_entry(linked_task_id=7), "linked_task_id must be a string"),
+    (_entry(timestamp="yesterday"), "unparseable timestamp"),
+    (_entry(timestamp=1e30), "unparseable timestamp"),
+    (_entry(timestamp=float("inf")), "unparseable timestamp"),
+    (_entry(timestamp=1767600000000), "unparseable timestamp"),
+])
+def test_invalid_entries_are_rejected(item, error):
+    assert _error(item) == error
+
+
+def test_older_task_type_names_are_mapped():
+    assert validate_log_entry(_entry(task_type="Custom Task"), "Arth", NOW)[0]["task_type"] == "Custom"
+
+
+def test_leader_may_log_for_anyone():
+    assert _error(_entry(member="Arryan"), user="Member 4") is None
+
+
+def test_timestamps_accept_epochs_and_text():
+    assert validate_log_entry(_entry(timestamp=1767600000), "Arth", NOW)[0]["timestamp"] == 1767600000
+    assert validate_log_entry(_entry(timestamp="2026-01-05 09:00:00"), "Arth", NOW)[0]["timestamp"] == \
+        parse_timestamp("2026-01-05 09:00:00")
+
+
+def _basic(user, password):
+    return "Basic " + base64.b64encode(f"{user}:{password}".encode()).decode()
+
+
+def test_authenticate():
+    assert authenticate(_basic("Arth", "123")) == "Arth"
+    for header in [None, "", _basic("Arth", "wrong"), _basic("Nobody", "123"), "Bearer abc", "Basic !!!",
+                   "Basic é", "Basic " + base64.b64encode(b"Arth:\xff").decode()]:
+        with pytest.raises(RequestError) as rejected:
+            authenticate(header)
+        assert rejected.value.status == 401
+
+
+def _task(task_id, member, status="Assigned"):
+    return {"id": task_id, "member": member, "task": "t", "deadline": None, "status": status, "approved": False}
+
+
+def _post(store, path, body, user, password="123"):
+    """Route one request through a server whose batching writers are running."""
+    async def run():
+        server = IngestServer(store, max_delay=0)
+        server._logs, server._task_updates = asyncio.Queue(), asyncio.Queue()
+        writers = [asyncio.create_task(server._drain(server._logs, server._write_logs)),
+                   asyncio.create_task(server._drain(server._task_updates, server._write_task_updates))]
+        try:
+            return await server._route("POST", path, {"authorization": _basic(user, password)}, json.dumps(body).encode())
+        except RequestError as e:
+            return e.status, e.body
+        finally:
+            for writer in writers:
+                writer.cancel()
+    return asyncio.run(run())
+
+
+def _exchange(store, request: bytes) -> bytes:
+    """Send raw bytes to a listening server and read until it closes the connection."""
+    async def run():
+        server = await asyncio.start_server(IngestServer(store)._handle, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(request)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+    return asyncio.run(run())
+
+
+def test_non_ascii_credentials_get_a_401(store):
+    request = "POST /logs HTTP/1.1\r\nAuthorization: Basic é\r\nConnection: close\r\nContent-Length: 2\r\n\r\n[]"
+    response = _exchange(store, request.encode("latin-1"))
+    assert response.startswith(b"HTTP/1.1 401 ")
+
+
+def test_chunked_bodies_are_refused_and_the_connection_closed(store):
+    response = _exchange(store, b"POST /logs HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                b"2\r\n[]\r\n0\r\n\r\nGET /health HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 411 ")
+    assert b"Connection: close" in response
+    assert response.count(b"HTTP/1.1") == 1
+    assert store.logs_since(0) == []
+
+
+def _statuses(store):
+    return {tid: t["status"] for tid, t in store.get_tasks(["TASK-1", "TASK-2", "TASK-3"]).items()}
+
+
+@pytest.fixture
+def tasks(store):
+    store.put_tasks([_task("TASK-1", "Arth"), _task("TASK-2", "Arryan"), _task("TASK-3", "Arth", "Approved")])
+    return store
+
+
+def test_logs_are_written_and_move_their_linked_task(tasks):
+    status, body = _post(tasks, "/logs", [_entry(status="In Progress", linked_task_id="TASK-1"), _entry()], "Arth")
+    assert (status, body) == (200, {"accepted": 2, "last_seq": 2})
+    assert _statuses(tasks)["TASK-1"] == "In Progress"
+
+
+def test_logs_are_kept_with_a_warning_when_the_linked_task_keeps_changing(tasks, monkeypatch):
+    def conflict(task_list):
+        raise TaskConflict([t["id"] for t in task_list])
+    monkeypatch.setattr(tasks, "put_tasks", conflict)
+    status, body = _post(tasks, "/logs", [_entry(status="In Progress", linked_task_id="TASK-1")], "Arth")
+    assert (status, body) == (200, {"accepted": 1, "last_seq": 1, "warning": LINKED_TASK_NOT_UPDATED})
+    assert len(tasks.logs_since(0)) == 1
+    assert _statuses(tasks)["TASK-1"] == "Assigned"
+
+
+@pytest.mark.parametrize("linked, error", [
+    ("TASK-404", "unknown linked_task_id"),
+    ("TASK-2", "members may only link their own tasks"),
+    ("TASK-3", "linked task is no longer open"),
+])
+def test_linked_tasks_need_write_rights(tasks, linked, error):
+    status, body = _post(tasks, "/logs", [_entry(), _entry(linked_task_id=linked)], "Arth")
+    assert (status, body) == (400, {"errors": [{"index": 1, "error": error}]})
+    assert tasks.logs_since(0) == []
+    assert _statuses(tasks) == {"TASK-1": "Assigned", "TASK-2": "Assigned", "TASK-3": "Approved"}
+
+
+def test_leader_may_link_any_task(tasks):
+    status, _ = _post(tasks, "/logs", _entry(member="Arryan", linked_task_id="TASK-2"), "Member 4", "leader")
+    assert status == 200
+    assert _statuses(tasks)["TASK-2"] == "Completed"
+
+
+def test_one_invalid_item_rejects_the_request(tasks):
+    status, body = _post(tasks, "/logs", [_entry(), _entry(status="Done"), _entry(task="")], "Arth")
+    assert status == 400
+    assert body["errors"] == [{"index": 1, "error": "invalid status"}, {"index": 2, "error": "empty task"}]
+    assert tasks.logs_since(0) == []
+
+
+def test_task_status_updates_follow_member_rules(tasks):
+    assert _post(tasks, "/tasks/status", {"id": "TASK-1", "status": "Completed"}, "Arth") == (200, {"updated": 1})
+    status, body = _post(tasks, "/tasks/status", [{"id": "TASK-2", "status": "Completed"},
+                                                  {"id": "TASK-3", "status": "In Progress"}], "Arth")
+    assert status == 400
+    assert body["errors"] == [{"index": 0, "error": "members may only update their own tasks"},
+                              {"index": 1, "error": "task is no longer open"}]
+    assert _post(tasks, "/tasks/status", {"id": "TASK-1", "status": "Approved"}, "Arth")[0] == 400
+    assert _statuses(tasks) == {"TASK-1": "Completed", "TASK-2": "Assigned", "TASK-3": "Approved"}
@@ -0,0 +1,70 @@
+import pytest
+
+from log_io import json_export, ndjson_export, read_log_import, validate_log_import
+from records import LogRecord
+
+
+def _validate(csv, task_ids=()):
+    return validate_log_import(read_log_import("logs.csv", csv.encode()), task_ids)
+
+
+def _errors(rejected):
+    return rejected["error"].tolist()
+
+
+def test_valid_rows_become_store_entries():
+    entries, rejected = _validate("member,task,status,time_spent,timestamp,linked_task_id\n"
+                                  "Arth,fetch,Completed,30,1767600000,TASK-1\n", task_ids={"TASK-1"})
+    assert rejected.empty
+    assert entries == [{"timestamp": 1767600000, "member": "Arth", "role": "Backend 1", "task": "fetch",
+                        "task_type": "Custom", "status": "Completed", "time_spent": 30, "notes": "",
+                        "linked_task_id": "TASK-1"}]
+
+
+def test_missing_columns_reject_the_file():
+    with pytest.raises(ValueError, match="task, status"):
+        _validate("member,time_spent\nArth,3\n")
+
+
+def test_invalid_rows_are_rejected_one_by_one():
+    entries, rejected = _validate(
+        "member,task,status,time_spent,task_type,linked_task_id,timestamp\n"
+        "Nobody,a,Completed,1,,,\n"
+        "Arth,,Completed,1,,,\n"
+        "Arth,a,Done,1,,,\n"
+        "Arth,a,Completed,1,Weird,,\n"
+        "Arth,a,Completed,-1,,,\n"
+        "Arth,a,Completed,2.5,,,\n"
+        "Arth,a,Completed,1,,TASK-9,\n"
+        "Arth,a,Completed,1,,,1767600000000\n"
+        "Arth,ok,Completed,1,,,\n")
+    assert [e["task"] for e in entries] == ["ok"]
+    assert _errors(rejected) == ["unknown member", "empty task", "invalid status", "invalid task_type",
+                                 "time_spent must be a whole number of minutes >= 0",
+                                 "time_spent must be a whole number of minutes >= 0",
+                                 "unknown linked_task_id", "unparseable timestamp"]
+
+
+def test_huge_time_spent_is_rejected_not_wrapped():
+    entries, rejected = _validate("member,task,status,time_spent\nArth,a,Completed,1e20\nArth,b,Completed,10080\n")
+    assert [(e["task"], e["time_spent"]) for e in entries] == [("b", 10080)]
+    assert _errors(rejected) == ["time_spent must be at most 10080 minutes"]
+
+
+def _logs():
+    base = {"timestamp": 1767600000, "member": "Arth", "role": "Backend 1", "status": "Completed",
+            "time_spent": 30, "notes": "", "linked_task_id": None}
+    return [LogRecord(dict(base, seq=1, task="fetch", task_type="Custom", notes="ünïcode\nnotes")),
+            LogRecord(dict(base, seq=2, task="duty", task_type="Assigned Duty")),
+            LogRecord(dict(base, seq=3, task="linked", task_type="Assigned Task", linked_task_id="TASK-1")),
+            LogRecord(dict(base, seq=4, task="older", task_type="Custom Task"))]  # as the Add Log form stored it
+
+
+@pytest.mark.parametrize("file_name, export", [("logs.json", json_export), ("logs.ndjson", ndjson_export)])
+def test_exports_import_back_unchanged(file_name, export):
+    logs = _logs()
+    entries, rejected = validate_log_import(read_log_import(file_name, export(logs).encode()), {"TASK-1"})
+    assert rejected.empty
+    expected = [{key: value for key, value in log.to_dict().items() if key != "seq"} for log in logs]
+    expected[3]["task_type"] = "Custom"
+    assert entries == expected
@@ -0,0 +1,72 @@
+import threading
+
+from archive import LogArchive
+from log_state import LogState
+
+
+def _log(i, member="Arth", status="Completed"):
+    return {"timestamp": 1000 + i, "member": member, "role": "Backend 1", "task": f"task {i}",
+            "task_type": "Custom", "status": status, "time_spent": i, "notes": "judgment" if i % 2 else "",
+            "linked_task_id": None}
+
+
+def test_sync_pulls_only_the_logs_after_the_cursor(store, tmp_path):
+    archive, state = LogArchive(str(tmp_path)), LogState()
+    store.append_logs([_log(i) for i in range(3)])
+    assert state.sync(store, archive) == 3
+    store.append_logs([_log(3, "Arryan", "In Progress")])
+    assert state.sync(store, archive) == 1
+    assert state.sync(store, archive) == 0
+    assert state.cursor == 4
+    assert [log.seq for log in state.logs] == [1, 2, 3, 4]
+    assert state.postings["member"] == {"Arth": [0, 1, 2], "Arryan": [3]}
+    assert state.search_index.search("judg") == [1, 3]
+    assert state.member_stats["Arth"]["total_tasks"] == 3
+    assert [log.task for log in state.logs_by_member["Arryan"]] == ["task 3"]
+
+
+def test_older_task_type_names_are_mapped(store, tmp_path):
+    store.append_logs([dict(_log(0), task_type="Custom Task")])
+    state = LogState()
+    state.sync(store, LogArchive(str(tmp_path)))
+    assert state.logs[0].task_type == "Custom"
+    assert state.postings["task_type"] == {"Custom": [0]}
+
+
+def test_backfilled_logs_clear_time_order(store, tmp_path):
+    store.append_logs([_log(5), _log(1)])
+    state = LogState()
+    state.sync(store, LogArchive(str(tmp_path)))
+    assert state.time_ordered is False
+
+
+def test_sealed_logs_count_from_their_summaries(store, tmp_path):
+    archive = LogArchive(str(tmp_path))
+    store.append_logs([_log(i) for i in range(10)])
+    synced = LogState()
+    synced.sync(store, archive)
+    archive.seal(store, 1006)
+
+    fresh = LogState()
+    fresh.sync(store, archive)
+    assert (fresh.summarized_through, fresh.summarized_count) == (6, 6)
+    assert [log.seq for log in fresh.logs] == [7, 8, 9, 10]
+    assert fresh.member_stats == synced.member_stats
+    assert fresh.rollups.totals() == synced.rollups.totals()
+
+    # A state that had already synced them keeps them, and just moves on.
+    store.append_logs([_log(10)])
+    assert synced.sync(store, archive) == 1
+    assert len(synced.logs) == 11 and synced.summarized_count == 0
+
+
+def test_concurrent_syncs_ingest_each_log_once(store, tmp_path):
+    archive, state = LogArchive(str(tmp_path)), LogState()
+    store.append_logs([_log(i) for i in range(200)])
+    threads = [threading.Thread(target=state.sync, args=(store, archive)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [log.seq for log in state.logs] == list(range(1, 201))
+    assert state.member_stats["Arth"]["total_tasks"] == 200
@@ -0,0 +1,55 @@
+from search import SearchIndex, tokenize
+
+
+def _index(*docs):
+    index = SearchIndex()
+    for position, (task, notes) in enumerate(docs):
+        index.add(position, task, notes)
+    return index
+
+
+def test_tokenize_casefolds_and_splits_on_punctuation():
+    assert tokenize("Fetched 50 Judgments, via API!") == ["fetched", "50", "judgments", "via", "api"]
+    assert tokenize("") == [] and tokenize(None) == []
+
+
+def test_tokenize_keeps_devanagari_words_whole():
+    assert tokenize("अनुबंध की समीक्षा। जोखिम") == ["अनुबंध", "की", "समीक्षा", "जोखिम"]
+
+
+def test_every_query_term_must_match_as_a_prefix():
+    index = _index(("Fetch judgments", ""), ("Design schema", "judgment table"), ("Fetched contracts", "from the API"))
+    assert index.search("judg") == [0, 1]
+    assert index.search("fetch") == [0, 2]
+    assert index.search("judg fetch") == [0]
+    assert index.search("fetch api") == [2]
+    assert index.search("missing") == []
+
+
+def test_terms_match_in_task_or_notes_once_per_log():
+    index = _index(("schema", "schema review"))
+    assert index.search("schema") == [0]
+    assert index.search("review") == [0]
+
+
+def test_single_character_terms_match_exactly():
+    index = _index(("a b", ""), ("abc", ""))
+    assert index.search("a") == [0]
+    assert index.search("ab") == [1]
+
+
+def test_query_is_case_and_punctuation_insensitive():
+    index = _index(("API endpoints", ""))
+    assert index.search("Api, ENDPOINT!") == [0]
+
+
+def test_empty_query_matches_nothing():
+    assert _index(("anything", "")).search("  ...  ") == []
+
+
+def test_positions_stay_ascending_as_logs_are_added():
+    index = SearchIndex()
+    for position in range(5):
+        index.add(position, "judgment" if position % 2 == 0 else "judge", "")
+    assert index.search("judg") == [0, 1, 2, 3, 4]
+    assert index.search("judgment") == [0, 2, 4]
@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+
+from storage import TaskConflict, open_store
+
+
+def _task(task_id, status="Assigned", **fields):
+    return dict({"id": task_id, "member": "Arth", "task": "t", "deadline": None,
+                 "status": status, "approved": False}, **fields)
+
+
+def test_new_tasks_are_stored_at_version_1(store):
+    store.put_tasks([_task("TASK-1"), _task("TASK-2")])
+    tasks = store.get_tasks(["TASK-1", "TASK-2"])
+    assert {tid: t["version"] for tid, t in tasks.items()} == {"TASK-1": 1, "TASK-2": 1}
+
+
+def test_write_based_on_current_version_succeeds(store):
+    store.put_task(_task("TASK-1"))
+    task = store.get_tasks(["TASK-1"])["TASK-1"]
+    store.put_task(dict(task, status="Completed"))
+    task = store.get_tasks(["TASK-1"])["TASK-1"]
+    assert (task["status"], task["version"]) == ("Completed", 2)
+
+
+def test_stale_write_rejects_the_whole_batch(store):
+    store.put_tasks([_task("TASK-1"), _task("TASK-2")])
+    current = store.get_tasks(["TASK-1", "TASK-2"])
+    store.put_task(dict(current["TASK-2"], status="In Progress"))  # someone else's write
+    with pytest.raises(TaskConflict) as conflict:
+        store.put_tasks([dict(current["TASK-1"], status="Completed"), dict(current["TASK-2"], status="Completed")])
+    assert conflict.value.task_ids == ["TASK-2"]
+    after = store.get_tasks(["TASK-1", "TASK-2"])
+    assert (after["TASK-1"]["status"], after["TASK-1"]["version"]) == ("Assigned", 1)
+    assert (after["TASK-2"]["status"], after["TASK-2"]["version"]) == ("In Progress", 2)
+
+
+def test_creating_an_existing_id_conflicts(store):
+    store.put_task(_task("TASK-1"))
+    with pytest.raises(TaskConflict):
+        store.put_task(_task("TASK-1", task="other"))
+
+
+def test_batch_delete_is_all_or_nothing(store):
+    store.put_tasks([_task("TASK-1"), _task("TASK-2"), _task("TASK-3")])
+    with pytest.raises(TaskConflict) as conflict:
+        store.delete_tasks([("TASK-1", 1), ("TASK-2", 0), ("TASK-3", 1)])
+    assert conflict.value.task_ids == ["TASK-2"]
+    assert sorted(store.get_tasks(["TASK-1", "TASK-2", "TASK-3"])) == ["TASK-1", "TASK-2", "TASK-3"]
+
+    store.delete_tasks([("TASK-1", 1), ("TASK-2", 1)])
+    assert sorted(store.get_tasks(["TASK-1", "TASK-2", "TASK-3"])) == ["TASK-3"]
+
+
+def test_deletes_reach_other_cursors_as_tombstones(store):
+    store.put_tasks([_task("TASK-1"), _task("TASK-2")])
+    cursor = store.tasks_since(0)[-1][0]
+    store.delete_task("TASK-1", 1)
+    assert [(tid, task) for _, tid, task in store.tasks_since(cursor)] == [("TASK-1", None)]
+
+
+def test_a_deleted_id_can_be_reused_from_its_last_version(store):
+    store.put_task(_task("TASK-1"))
+    store.delete_task("TASK-1", 1)
+    store.put_task(_task("TASK-1", version=2))
+    assert store.get_tasks(["TASK-1"])["TASK-1"]["version"] == 3
+
+
+def test_allocate_ids_hands_out_consecutive_ranges(store):
+    assert list(store.allocate_ids("TASK", 3)) == [1, 2, 3]
+    assert list(store.allocate_ids("TASK")) == [4]
+    assert list(store.allocate_ids("MILESTONE", 2)) == [1, 2]
+
+
+def test_allocate_ids_are_unique_across_threads(store):
+    allocated = []
+
+    def allocate():
+        for _ in range(50):
+            allocated.extend(store.allocate_ids("TASK", 2))
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(allocated) == list(range(1, 8 * 50 * 2 + 1))
+
+
+def test_allocate_ids_are_unique_across_connections(tmp_path):
+    url = f"sqlite:///{tmp_path / 'store.db'}"
+    first, second = open_store(url), open_store(url)
+    ids = [n for _ in range(20) for s in (first, second) for n in s.allocate_ids("TASK", 3)]
+    assert sorted(ids) == list(range(1, 121))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Stamps task events with ``clock.now`` instead of the wall clock, and snapshots every 3 events."""
+    import storage
+
+    class Clock:
+        now = 1000
+
+    monkeypatch.setattr(storage, "epoch_seconds", lambda dt: Clock.now)
+    monkeypatch.setattr(storage, "TASK_SNAPSHOT_EVERY", 3)
+    return Clock
+
+
+def _states(tasks):
+    return {tid: t["status"] for tid, t in tasks.items()}
+
+
+def test_tasks_at_replays_events_after_the_nearest_snapshot(store, clock):
+    truth, versions = {}, {}
+    for step in range(12):
+        clock.now = 1000 + 10 * step
+        task_id = f"TASK-{step % 4}"
+        current = store.get_tasks([task_id]).get(task_id)
+        if current is None:
+            store.put_task(_task(task_id, version=versions.get(task_id, 0)))
+        elif step % 5 == 0:
+            store.delete_task(task_id, current["version"])
+        else:
+            store.put_task(dict(current, status=f"step {step}"))
+        versions[task_id] = versions.get(task_id, 0) + 1
+        truth[clock.now] = _states(store.get_tasks(["TASK-0", "TASK-1", "TASK-2", "TASK-3"]))
+
+    assert store.task_snapshot_at(clock.now)[0] > 0
+    for at, expected in truth.items():
+        assert _states(store.tasks_at(at)) == expected
+        assert _states(store.tasks_at(at + 5)) == expected
+    assert store.tasks_at(999) == {}
+
+
+def test_tasks_at_uses_the_last_snapshot_taken_by_then(store, clock):
+    store.put_tasks([_task("TASK-1"), _task("TASK-2"), _task("TASK-3")])  # a snapshot at 1000
+    clock.now = 2000
+    store.put_tasks([_task("TASK-4"), _task("TASK-5"), _task("TASK-6")])  # and one at 2000
+    assert store.task_snapshot_at(1500)[0] == 3
+    assert sorted(store.tasks_at(1500)) == ["TASK-1", "TASK-2", "TASK-3"]
+    assert len(store.tasks_at(2000)) == 6
+
+
+def test_task_history_lists_every_write_of_one_task(store, clock):
+    store.put_task(_task("TASK-1"))
+    store.put_task(_task("TASK-2"))
+    store.put_task(dict(store.get_tasks(["TASK-1"])["TASK-1"], status="Completed"))
+    store.delete_task("TASK-1", 2)
+    history = store.task_history("TASK-1")
+    assert [seq for seq, _, _, _ in history] == [1, 3, 4]
+    assert [task and task["status"] for _, _, _, task in history] == ["Assigned", "Completed", None]